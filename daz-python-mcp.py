@@ -19,51 +19,127 @@
 # ─────────────────────────────────────────────────────────────────────────────
 
 import asyncio
+import concurrent.futures
+import functools
+import inspect
 import json
+import multiprocessing
 import os
+import re
 import subprocess
 import sys
 import textwrap
+import time
 import traceback
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
 
 # Prevent tokenizer deadlocks when forking subprocesses
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 # Prevent .pyc files during test runs
 os.environ["PYTHONDONTWRITEBYTECODE"] = "1"
 
-import mcp.server.stdio
-import mcp.types as types
-from mcp.server import NotificationOptions, Server
-from mcp.server.models import InitializationOptions
+import orjson
 
-from indexer import CodeIndexer
-from handler_base import get_handler_for, Thing
+# mcp and the indexer (chromadb) are imported lazily: they dominate start-up
+from handler_base import from_bytes, from_cached, get_handler_for, parse_ref, Thing
+from handler_cache import HandlerCache
+from persistent_git import PersistentGit
 from file_verifier import FileVerifier
 
+# porcelain=v2 status codes → descriptions; index (X) and worktree (Y) side
+_INDEX_STATUS = {
+    "M": "staged modified",
+    "T": "staged modified",
+    "A": "staged added",
+    "D": "staged deleted",
+    "R": "staged renamed",
+    "C": "staged copied",
+}
+_WORKTREE_STATUS = {"M": "modified", "T": "modified", "D": "deleted"}
+# porcelain=v2 entry type → number of space-separated fields before the path
+_STATUS_PATH_FIELD = {"1": 8, "2": 9, "u": 10}
+
+# .gitattributes that make a checkout differ from its blob (filters, eol rewriting)
+_CONVERTING_ATTRS = re.compile(r"\b(?:filter|eol|text)\b")
+
+# heavy directories never worth walking when git can't list files for us
+_SKIP = frozenset({"node_modules", "__pycache__", "venv", ".venv", "build", "dist"})
+
+
+def _walk(root: Path) -> List[str]:
+    """Relative paths of all regular files under root, pruning hidden/_SKIP dirs."""
+    stack, out = [str(root)], []
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue  # unreadable directory: list what we can
+        with it:
+            for e in it:
+                if e.name[0] == "." or e.name in _SKIP:
+                    continue
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif e.is_file(follow_symlinks=False):
+                    out.append(os.path.relpath(e.path, root))
+    return out
+
 
 # --------------------------------------------------------------------------- #
 #  MCP server
 # --------------------------------------------------------------------------- #
 class PyProjectMCPServer:
+    # below this many files, process start-up costs more than parsing saves
+    PARALLEL_PARSE_MIN = 64
+    # seconds a cached git status / file list is served without re-running git
+    STATUS_TTL = 2.0
+
     def __init__(self):
-        self.server = Server("daz-python-code-navigator")
+        self.server = None  # created by run()
         self.repos: Dict[str, Path] = {}
+        self._cfg_mtime: Optional[int] = None  # config.json mtime behind repos
         self.open_handlers: Dict[str, Dict[str, Any]] = {}
+        # same handlers, .py files only (kept in step with open_handlers)
+        self._py_handlers: Dict[str, Dict[str, Any]] = {}
         self._active_changes: Set[str] = set()
+        self._git_procs: Dict[str, PersistentGit] = {}
+        # (repo, query) -> (.git stamp, monotonic time, result); see _cached_git
+        self._status_cache: Dict[tuple, tuple] = {}
+        self._status_refresh: Dict[tuple, asyncio.Task] = {}
+        # repo -> background index_repository run started by open
+        self._index_tasks: Dict[str, asyncio.Task] = {}
+        # files written/added/deleted since the last commit (plus local changes
+        # found at open): re-indexed and staged by end_change
+        self._dirty: Dict[str, Set[str]] = defaultdict(set)
+        # write/add/end_change/close hold their repo's lock throughout, so two
+        # edits can't interleave their read-modify-write of a handler's text
+        self._repo_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # (repo, file) -> (handler, handler.version, outline dict)
+        self._outlines: Dict[tuple, tuple] = {}
+        # blocking work (git, pylint, tests, parsing) runs here, off the loop
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=os.cpu_count()
+        )
+        from indexer import CodeIndexer
+
         self.indexer = CodeIndexer()
         self.verifier = FileVerifier()
-        self._register_handlers()
 
     # ------------------------------------------------ configuration
     def _load_config(self):
+        """(Re)read config.json; a no-op while its mtime is unchanged."""
         cfg = Path(__file__).with_name("config.json")
-        self.repos = {
-            n: Path(p).expanduser().resolve()
+        mtime = cfg.stat().st_mtime_ns
+        if mtime == self._cfg_mtime:
+            return
+        paths = {
+            n: Path(p).expanduser().resolve(strict=False)
             for n, p in json.loads(cfg.read_text()).get("repositories", {}).items()
-            if Path(p).expanduser().exists()
         }
+        self.repos = {n: p for n, p in paths.items() if os.path.isdir(p)}
+        self._cfg_mtime = mtime
 
     # ------------------------------------------------ instructions handling
     def _get_instructions_path(self, repo: str) -> Path:
@@ -153,68 +229,261 @@ class PyProjectMCPServer:
 
     # ------------------------------------------------ list_repositories
     def _list_repositories(self):
-        if not self.repos:
-            self._load_config()
+        self._load_config()  # picks up config.json edits
         return {"repositories": {name: str(path) for name, path in self.repos.items()}}
 
     # ------------------------------------------------ git helpers
-    def _git(self, root: Path, *args):
-        return subprocess.check_output(["git", *args], cwd=root, text=True).strip()
+    async def _in_pool(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._io_pool, functools.partial(fn, *args, **kwargs)
+        )
 
-    def _git_list_files(self, root: Path):
-        try:
-            all_files = self._git(
-                root, "ls-files", "--others", "--cached", "--exclude-standard"
-            ).splitlines()
-            existing_files = [rel for rel in all_files if (root / rel).exists()]
-            return existing_files
-        except Exception:
-            return [
-                str(p.relative_to(root))
-                for p in root.rglob("*")
-                if p.is_file() and not p.name.startswith(".")
-            ]
+    async def _git(self, root: Path, *args) -> str:
+        out = await self._in_pool(
+            subprocess.check_output,
+            ["git", *args],
+            cwd=root,
+            text=True,
+            stdin=subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
+        )
+        return out.rstrip()
+
+    async def _commit(self, root: Path, paths: List[str], message: str):
+        """Stage exactly `paths` (no whole-tree `add --all` scan) and commit."""
+        present = [p for p in paths if (root / p).exists()]
+        gone = [p for p in paths if not (root / p).exists()]
+        # dirty paths are file names, not pathspecs: `x[1].py` must not glob
+        if gone:
+            await self._git(
+                root,
+                "--literal-pathspecs",
+                "rm",
+                "-q",
+                "--cached",
+                "--ignore-unmatch",
+                "--",
+                *gone,
+            )
+        if present:
+            ignored = await self._in_pool(self._ignored, root, present)
+            present = [p for p in present if p not in ignored]
+        if not present and not gone:
+            return  # only gitignored files changed: nothing to record
+        if present:
+            await self._git(root, "--literal-pathspecs", "add", "-A", "--", *present)
+        await self._git(root, "commit", "-m", message, "--no-verify")
+
+    @staticmethod
+    def _ignored(root: Path, paths: List[str]) -> Set[str]:
+        """Untracked paths git would refuse to `add` because .gitignore covers them."""
+        proc = subprocess.run(
+            ["git", "check-ignore", "--stdin", "-z"],
+            cwd=root,
+            input="\0".join(paths) + "\0",
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode > 1:
+            raise subprocess.CalledProcessError(
+                proc.returncode, proc.args, proc.stdout, proc.stderr
+            )
+        return set(filter(None, proc.stdout.split("\0")))
 
-    def _git_check_status(self, root: Path):
-        """Check if there are any modified, staged, or untracked files."""
-        try:
-            status_output = self._git(root, "status", "--porcelain")
-            if not status_output:
-                return {"clean": True, "files": []}
-
-            changed_files = []
-            for line in status_output.splitlines():
-                if len(line) >= 3:
-                    status = line[:2]
-                    filename = line[3:]
-                    index_status = status[0]
-                    worktree_status = status[1]
-                    file_info = {"file": filename, "status": []}
-
-                    if index_status == "M":
-                        file_info["status"].append("staged modified")
-                    elif index_status == "A":
-                        file_info["status"].append("staged added")
-                    elif index_status == "D":
-                        file_info["status"].append("staged deleted")
-                    elif index_status == "R":
-                        file_info["status"].append("staged renamed")
-                    elif index_status == "C":
-                        file_info["status"].append("staged copied")
-
-                    if worktree_status == "M":
-                        file_info["status"].append("modified")
-                    elif worktree_status == "D":
-                        file_info["status"].append("deleted")
-                    elif worktree_status == "?":
-                        file_info["status"].append("untracked")
-
-                    changed_files.append(file_info)
-
-            return {"clean": False, "files": changed_files}
-        except Exception:
+    def _git_many(self, root: Path, *commands) -> List[Optional[str]]:
+        """Run several git commands concurrently; None for any that failed."""
+        procs = []
+        for args in commands:
+            try:
+                procs.append(
+                    subprocess.Popen(
+                        ["git", *args],
+                        cwd=root,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                        text=True,
+                    )
+                )
+            except OSError:
+                procs.append(None)
+        outputs = []
+        for proc in procs:
+            if proc is None:
+                outputs.append(None)
+                continue
+            out, _ = proc.communicate()
+            outputs.append(out.rstrip() if proc.returncode == 0 else None)
+        return outputs
+
+    @staticmethod
+    def _status_args(include_untracked: bool) -> tuple:
+        return (
+            "--no-optional-locks",
+            "-c",
+            "core.preloadindex=true",
+            "status",
+            "--porcelain=v2",
+            "-z",
+            "--branch",
+            "--no-ahead-behind",
+            "-unormal" if include_untracked else "-uno",
+        )
+
+    def _git_check_status(self, root: Path, *, include_untracked: bool = True):
+        """Working-tree status; without untracked files it skips the tree walk."""
+        (out,) = self._git_many(root, self._status_args(include_untracked))
+        return self._parse_status(out)
+
+    def _git_status_and_files(self, root: Path):
+        """One round of git on the open path: (status info, file list).
+
+        Untracked files come from ls-files (which lists them anyway), so
+        status itself doesn't have to walk untracked subtrees. ls-files also
+        tags index entries missing from disk ("R", via --deleted), so the
+        file list needs no per-file existence check."""
+        status_out, files_out = self._git_many(
+            root,
+            self._status_args(False),
+            (
+                "ls-files",
+                "-z",  # raw paths: without it non-ASCII names come back quoted
+                "-t",
+                "--others",
+                "--cached",
+                "--deleted",
+                "--exclude-standard",
+            ),
+        )
+        status = self._parse_status(status_out)
+        if files_out is None:
+            return status, _walk(root)
+        listed, gone = [], set()
+        for entry in files_out.split("\0"):
+            if not entry:
+                continue
+            tag, _, rel = entry.partition(" ")
+            if tag == "R":
+                gone.add(rel)
+                continue
+            if tag == "?":
+                status["files"].append({"file": rel, "status": ["untracked"]})
+            listed.append(rel)
+        status["clean"] = not status["files"]
+        # unmerged paths are listed once per stage
+        return status, [rel for rel in dict.fromkeys(listed) if rel not in gone]
+
+    def _git_proc(self, name: str, root: Path) -> Optional[PersistentGit]:
+        """The repo's long-lived object reader, or None if blobs can't be trusted."""
+        attrs = root / ".gitattributes"
+        if attrs.exists() and _CONVERTING_ATTRS.search(
+            attrs.read_text(errors="ignore")
+        ):
+            return None  # blobs differ from checkout (LFS, eol etc.) → read from disk
+        autocrlf = subprocess.run(
+            ["git", "config", "--get", "core.autocrlf"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+        if autocrlf.lower() not in ("", "false", "no", "off", "0"):
+            return None  # line endings are rewritten on checkout → read from disk
+        git = self._git_procs.get(name)
+        if git is None:
+            git = self._git_procs[name] = PersistentGit(root)
+        return git if git.start() else None
+
+    def _parse_status(self, status_output: Optional[str]):
+        """Summarise `git status --porcelain=v2 -z`: staged, modified, untracked."""
+        if not status_output:
             return {"clean": True, "files": []}
 
+        branch, changed_files = None, []
+        fields = iter(status_output.split("\0"))
+        for entry in fields:
+            kind = entry[:1]
+            if kind == "#":
+                if entry.startswith("# branch.head "):
+                    branch = entry[len("# branch.head ") :]
+                continue
+            if kind == "?":
+                changed_files.append({"file": entry[2:], "status": ["untracked"]})
+                continue
+            if kind not in _STATUS_PATH_FIELD:
+                continue  # "!" ignored entries, trailing empty field
+            parts = entry.split(" ", _STATUS_PATH_FIELD[kind])
+            filename = parts[-1]
+            if kind == "2":  # rename/copy: original path is the next field
+                filename = f"{next(fields, '')} -> {filename}"
+            xy = parts[1]
+            status = []
+            if kind == "u":
+                status.append("unmerged")
+            elif xy[0] in _INDEX_STATUS:
+                status.append(_INDEX_STATUS[xy[0]])
+            if kind != "u" and xy[1] in _WORKTREE_STATUS:
+                status.append(_WORKTREE_STATUS[xy[1]])
+            changed_files.append({"file": filename, "status": status})
+
+        return {"clean": not changed_files, "branch": branch, "files": changed_files}
+
+    async def _status(self, repo: str):
+        """Full status including untracked files (walks the working tree)."""
+        return await self._cached_git(
+            repo,
+            "status",
+            functools.partial(self._git_check_status, include_untracked=True),
+            stale_ok=True,
+        )
+
+    # ------------------------------------------------ git result cache
+    @staticmethod
+    def _git_stamp(root: Path) -> Optional[tuple]:
+        """mtimes of .git/index and .git/HEAD: commits, staging and branch
+        switches (ours or anyone else's) change them."""
+        try:
+            return tuple(
+                os.stat(root / ".git" / n).st_mtime_ns for n in ("index", "HEAD")
+            )
+        except OSError:
+            return None  # no index yet, worktree .git file, ... → don't cache
+
+    async def _cached_git(self, repo: str, query: str, fn, *, stale_ok: bool):
+        """fn(root) memoised per repo. Hits younger than STATUS_TTL are served
+        as is; older ones only when stale_ok, with a background refresh."""
+        key = (repo, query)
+        hit = self._status_cache.get(key)
+        stamp = self._git_stamp(self.repos[repo])
+        if stamp is not None and hit is not None and hit[0] == stamp:
+            if time.monotonic() - hit[1] < self.STATUS_TTL:
+                return hit[2]
+            if stale_ok:
+                if key not in self._status_refresh:
+                    task = asyncio.create_task(self._refresh_git(repo, query, fn))
+                    self._status_refresh[key] = task
+                    task.add_done_callback(
+                        lambda _t: self._status_refresh.pop(key, None)
+                    )
+                return hit[2]
+        return await self._refresh_git(repo, query, fn)
+
+    async def _refresh_git(self, repo: str, query: str, fn):
+        root = self.repos[repo]
+        stamp, started = self._git_stamp(root), time.monotonic()
+        value = await self._in_pool(fn, root)
+        self._status_cache[(repo, query)] = (stamp, started, value)
+        return value
+
+    def _touch(self, repo: str, rel: str):
+        """Record that `rel` changed: it's re-indexed and staged at end_change,
+        and cached git results for the repo are no longer trustworthy."""
+        self._dirty[repo].add(rel)
+        self._invalidate_git(repo)
+
+    def _invalidate_git(self, repo: str):
+        for key in [k for k in self._status_cache if k[0] == repo]:
+            del self._status_cache[key]
+
     # ------------------------------------------------ change session
     def _start_change(self, repo: str):
         if repo in self._active_changes:
@@ -223,177 +492,251 @@ class PyProjectMCPServer:
         return {"success": True, "message": "Change session started"}
 
     # ------------------------------------------------ end_change
-    def _end_change(self, repo: str, message: str):
-        root = self.repos[repo]
+    async def _end_change(self, repo: str, message: str):
+        async with self._repo_locks[repo]:
+            root = self.repos[repo]
+
+            # Get all files to verify
+            rel_files = list(self.open_handlers[repo].keys())
+            # the paths this change commits; edits landing during the awaits
+            # below stay dirty for the next end_change
+            snapshot = set(self._dirty[repo])
+
+            # Fail fast on rules the handlers already know about
+            for rel, h in self._py_handlers[repo].items():
+                if h.has_unittest_main:
+                    error = "contains unittest.main() which is not allowed"
+                elif not h.has_tests:
+                    error = "No unit tests found in file"
+                else:
+                    continue
+                return {
+                    "success": False,
+                    "message": f"{rel}: {error}",
+                    "diagnostics": {"mode": "whole_project", "failed_file": rel},
+                }
+
+            # Run verification on the whole project (pylint + unittest run
+            # concurrently inside the verifier) without blocking the event loop
+            try:
+                verify_result = await self._in_pool(
+                    self.verifier.verify, root, all_files=rel_files
+                )
+            except asyncio.CancelledError:
+                self.verifier.cancel(root)  # don't leave test/pylint runs behind
+                raise
 
-        # Get all files to verify
-        rel_files = list(self.open_handlers[repo].keys())
+            if not verify_result["success"]:
+                return {
+                    "success": False,
+                    "message": verify_result["error"],
+                    "diagnostics": verify_result["diagnostics"],
+                }
 
-        # Run verification on the whole project
-        verify_result = self.verifier.verify(root, all_files=rel_files)
+            # All good → refresh the index once for the whole session, commit
+            await self._index_settled(repo)
+            await self._in_pool(self._flush_index, repo)
+            await self._commit(root, sorted(snapshot), message)
+            self._dirty[repo] -= snapshot
+            self._invalidate_git(repo)
+            self._active_changes.discard(repo)
+
+            # Get current instructions
+            instructions = self._get_repo_instructions(repo)
+
+            # Prepare learning prompt
+            learning_prompt = (
+                f"Congratulations! Your action was a success and the change has been closed.\n\n"
+                f"We have instructions for dealing with this repository:\n"
+                f"{instructions}\n\n"
+                f"If you have learned anything during this change that could be added to "
+                f"the instructions to make further changes go smoother, please call "
+                f"dazbuild_update_instructions with a complete replacement instructions list."
+            )
 
-        if not verify_result["success"]:
             return {
-                "success": False,
-                "message": verify_result["error"],
+                "success": True,
+                "message": "Committed",
                 "diagnostics": verify_result["diagnostics"],
+                "learning_prompt": learning_prompt,
             }
 
-        # All good → commit
-        subprocess.check_call(["git", "add", "--all"], cwd=root)
-        subprocess.check_call(["git", "commit", "-m", message], cwd=root)
-        self._active_changes.discard(repo)
-
-        # Get current instructions
-        instructions = self._get_repo_instructions(repo)
-
-        # Prepare learning prompt
-        learning_prompt = (
-            f"Congratulations! Your action was a success and the change has been closed.\n\n"
-            f"We have instructions for dealing with this repository:\n"
-            f"{instructions}\n\n"
-            f"If you have learned anything during this change that could be added to "
-            f"the instructions to make further changes go smoother, please call "
-            f"dazbuild_update_instructions with a complete replacement instructions list."
-        )
-
-        return {
-            "success": True,
-            "message": "Committed",
-            "diagnostics": verify_result["diagnostics"],
-            "learning_prompt": learning_prompt,
-        }
-
     # ------------------------------------------------ outline
     def _outline(self, repo: str, ref: str):
-        def to_dict(t: Thing):
-            d = {"name": t.name, "span": t.span, "children": []}
-            for c in t.children.values():
-                d["children"].append(to_dict(c))
-            return d
-
-        h = self.open_handlers[repo][ref.split("::")[0]]
-        return {"outline": to_dict(h.structure)}
+        def to_dict(root: Thing):
+            out: Dict[str, Any] = {}
+            stack = [(root, out)]
+            while stack:
+                t, d = stack.pop()
+                d["name"] = t.name
+                d["span"] = t.span
+                kids = d["children"] = [None] * len(t.children)
+                for i, c in enumerate(t.children.values()):
+                    kids[i] = {}
+                    stack.append((c, kids[i]))
+            return out
+
+        rel = parse_ref(ref).file
+        h = self.open_handlers[repo][rel]
+        cached = self._outlines.get((repo, rel))
+        if cached is None or cached[0] is not h or cached[1] != h.version:
+            cached = (h, h.version, to_dict(h.structure))
+            self._outlines[(repo, rel)] = cached
+        return {"outline": cached[2]}
+
+    # ------------------------------------------------ handler bookkeeping
+    def _set_handler(self, repo: str, rel: str, h):
+        self.open_handlers[repo][rel] = h
+        if rel.endswith(".py"):
+            self._py_handlers[repo][rel] = h
+
+    def _drop_handler(self, repo: str, rel: str):
+        del self.open_handlers[repo][rel]
+        self._py_handlers[repo].pop(rel, None)
+
+    # ------------------------------------------------ incremental indexing
+    def _flush_index(self, repo: str):
+        """Re-index every file touched this session in one batch; the indexer
+        skips files whose content ended up unchanged."""
+        files, texts, done = {}, {}, []
+        for rel in sorted(self._dirty.get(repo, ())):
+            h = self.open_handlers[repo].get(rel)
+            if h is None:  # deleted
+                files[rel] = []
+                continue
+            files[rel] = h.changed_spans
+            texts[rel] = h.text
+            done.append((h, len(h.changed_spans)))
+        if files:
+            self.indexer.update_files(repo, self.repos[repo], files, texts)
+        # only once the index has them: a failed update leaves the spans as
+        # they were, so the next flush retries the same regions
+        for h, n_spans in done:
+            h.changed_spans = h.changed_spans[n_spans:]
 
     # ------------------------------------------------ thin wrappers
     def _get(self, repo, ref):
-        return {"content": self.open_handlers[repo][ref.split("::")[0]].get(ref)}
+        return {"content": self.open_handlers[repo][parse_ref(ref).file].get(ref)}
 
-    def _write(self, repo, ref, content):
-        if repo not in self._active_changes:
-            raise Exception("Must call dazbuild_start_change first")
+    async def _write(self, repo, ref, content):
+        async with self._repo_locks[repo]:
+            if repo not in self._active_changes:
+                raise Exception("Must call dazbuild_start_change first")
 
-        root = self.repos[repo]
-        rel_file = ref.split("::")[0]
+            root = self.repos[repo]
+            rel_file = parse_ref(ref).file
 
-        # Perform the write
-        h = self.open_handlers[repo][rel_file]
-        h.write(ref, content)
-        self.indexer.update_file(repo, root, rel_file)
+            # Perform the write
+            h = self.open_handlers[repo][rel_file]
+            h.write(ref, content)
+            self._touch(repo, rel_file)
 
-        # Verify the file after writing
-        verify_result = self.verifier.verify(root, rel_file)
+            # Verify the file after writing
+            verify_result = await self._in_pool(self.verifier.verify, root, rel_file)
 
-        if not verify_result["success"]:
-            # Revert the write by reloading the handler
-            self.open_handlers[repo][rel_file] = get_handler_for(root / rel_file)
-            self.indexer.update_file(repo, root, rel_file)
-            return {
-                "success": False,
-                "error": verify_result["error"],
-                "diagnostics": verify_result["diagnostics"],
-            }
+            if not verify_result["success"]:
+                # Revert the write by reloading the handler
+                self._set_handler(repo, rel_file, get_handler_for(root / rel_file))
+                return {
+                    "success": False,
+                    "error": verify_result["error"],
+                    "diagnostics": verify_result["diagnostics"],
+                }
 
-        return {"success": True, "diagnostics": verify_result["diagnostics"]}
+            return {"success": True, "diagnostics": verify_result["diagnostics"]}
 
-    def _delete(self, repo, reference):
+    async def _delete(self, repo, reference):
         """Delete a file from the repository."""
-        if repo not in self._active_changes:
-            raise Exception("Must call dazbuild_start_change first")
-
-        root = self.repos[repo]
-
-        if "::" in reference:
-            raise Exception(
-                "Can only delete whole files, not parts of files. Use dazbuild_write to modify file contents."
-            )
-
-        rel_path = reference
-
-        if rel_path not in self.open_handlers[repo]:
-            raise Exception(f"File {rel_path} not found in repository")
-
-        # Remove from filesystem
-        file_path = root / rel_path
-        if file_path.exists():
-            file_path.unlink()
-
-        # Remove from open handlers
-        del self.open_handlers[repo][rel_path]
-
-        return {"success": True, "deleted": rel_path}
+        async with self._repo_locks[repo]:
+            if repo not in self._active_changes:
+                raise Exception("Must call dazbuild_start_change first")
 
-    def _add(self, repo, obj_type, parent, name, content):
-        if repo not in self._active_changes:
-            raise Exception("Must call dazbuild_start_change first")
-        root = self.repos[repo]
+            root = self.repos[repo]
 
-        if obj_type == "file":
-            rel = str(Path(parent) / name) if parent else name
-            path = root / rel
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(content)
-            self.open_handlers[repo][rel] = get_handler_for(path)
-            self.indexer.update_file(repo, root, rel)
+            if "::" in reference:
+                raise Exception(
+                    "Can only delete whole files, not parts of files. Use dazbuild_write to modify file contents."
+                )
 
-            # Verify the new file
-            verify_result = self.verifier.verify(root, rel)
+            rel_path = reference
+
+            if rel_path not in self.open_handlers[repo]:
+                raise Exception(f"File {rel_path} not found in repository")
+
+            # Remove from filesystem
+            file_path = root / rel_path
+            if file_path.exists():
+                file_path.unlink()
+
+            # Remove from open handlers
+            self._drop_handler(repo, rel_path)
+            self._touch(repo, rel_path)
+
+            return {"success": True, "deleted": rel_path}
+
+    async def _add(self, repo, obj_type, parent, name, content):
+        async with self._repo_locks[repo]:
+            if repo not in self._active_changes:
+                raise Exception("Must call dazbuild_start_change first")
+            root = self.repos[repo]
+
+            if obj_type == "file":
+                rel = str(Path(parent) / name) if parent else name
+                path = root / rel
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(content)
+                self._set_handler(repo, rel, get_handler_for(path))
+                self._touch(repo, rel)
+
+                # Verify the new file
+                verify_result = await self._in_pool(self.verifier.verify, root, rel)
+
+                if not verify_result["success"]:
+                    # Remove the file if verification fails
+                    path.unlink()
+                    self._drop_handler(repo, rel)
+                    return {
+                        "success": False,
+                        "error": verify_result["error"],
+                        "diagnostics": verify_result["diagnostics"],
+                    }
 
-            if not verify_result["success"]:
-                # Remove the file if verification fails
-                path.unlink()
-                del self.open_handlers[repo][rel]
                 return {
-                    "success": False,
-                    "error": verify_result["error"],
+                    "success": True,
+                    "added_file": rel,
                     "diagnostics": verify_result["diagnostics"],
                 }
+            else:
+                # Adding to existing file
+                rel_file = parse_ref(parent).file
+                handler = self.open_handlers[repo][rel_file]
+                handler.add(parent, name, content)
+                self._touch(repo, rel_file)
+
+                # Verify the modified file
+                verify_result = await self._in_pool(
+                    self.verifier.verify, root, rel_file
+                )
 
-            return {
-                "success": True,
-                "added_file": rel,
-                "diagnostics": verify_result["diagnostics"],
-            }
-        else:
-            # Adding to existing file
-            rel_file = parent.split("::")[0]
-            handler = self.open_handlers[repo][rel_file]
-            handler.add(parent, name, content)
-            self.indexer.update_file(repo, root, rel_file)
-
-            # Verify the modified file
-            verify_result = self.verifier.verify(root, rel_file)
+                if not verify_result["success"]:
+                    # Reload the handler to revert changes
+                    self._set_handler(repo, rel_file, get_handler_for(root / rel_file))
+                    return {
+                        "success": False,
+                        "error": verify_result["error"],
+                        "diagnostics": verify_result["diagnostics"],
+                    }
 
-            if not verify_result["success"]:
-                # Reload the handler to revert changes
-                self.open_handlers[repo][rel_file] = get_handler_for(root / rel_file)
-                self.indexer.update_file(repo, root, rel_file)
                 return {
-                    "success": False,
-                    "error": verify_result["error"],
+                    "success": True,
+                    "added": name,
                     "diagnostics": verify_result["diagnostics"],
                 }
 
-            return {
-                "success": True,
-                "added": name,
-                "diagnostics": verify_result["diagnostics"],
-            }
-
-    def _verify(self, repo: str, reference: str):
+    async def _verify(self, repo: str, reference: str):
         """Verify a file without making changes."""
         root = self.repos[repo]
-        rel_file = reference.split("::")[0]
+        rel_file = parse_ref(reference).file
 
         if rel_file not in self.open_handlers[repo]:
             return {
@@ -401,50 +744,156 @@ class PyProjectMCPServer:
                 "error": f"File {rel_file} not found in repository",
             }
 
-        # Run verification on the file
-        verify_result = self.verifier.verify(root, rel_file)
+        # Run verification (tests + pylint) on the file, off the event loop
+        return await self._in_pool(self.verifier.verify, root, rel_file)
 
-        return verify_result
+    async def _search(self, repo, query, limit):
+        await self._index_ready(repo)
+        return {"matches": await self._in_pool(self.indexer.search, repo, query, limit)}
 
-    def _search(self, repo, query, limit):
-        return {"matches": self.indexer.search(repo, query, limit)}
+    async def _index_ready(self, repo: str):
+        """Wait for the repo's background index build (started by open)."""
+        task = self._index_tasks.get(repo)
+        if task is not None and not task.done():
+            await asyncio.shield(task)  # a cancelled caller mustn't stop the build
+        elif task is not None:
+            task.result()  # surface a failed build
 
     # ------------------------------------------------ repo open/close
-    def _open(self, name):
-        root = self.repos[name]
-        status_info = self._git_check_status(root)
-        files = self._git_list_files(root)
-        self.open_handlers[name] = {rel: get_handler_for(root / rel) for rel in files}
-        self.indexer.index_repository(
-            name, root, {k: h.structure for k, h in self.open_handlers[name].items()}
-        )
-
-        instructions = self._get_repo_instructions(name)
-        result = {"opened": True, "files": files, "instructions": instructions}
-
-        if not status_info["clean"]:
-            result["change_in_progress"] = True
-            result["changed_files"] = status_info["files"]
-            file_summaries = []
-            for file_info in status_info["files"]:
-                status_text = ", ".join(file_info["status"])
-                file_summaries.append(f"{file_info['file']} ({status_text})")
+    def _load_handlers(
+        self, name: str, root: Path, files: List[str], changed: Set[str]
+    ):
+        # Clean files come straight from git's object store over one pipe;
+        # anything modified/untracked is read from the working tree.
+        # Blobs whose parse is already in the on-disk cache skip parsing.
+        git = self._git_proc(name, root)
+        cache = HandlerCache.open(name)
+        handlers, keys = {}, {}
+        todo, paths, blobs = [], [], []
+        for rel in files:
+            path = root / rel
+            # a symlink's blob is its target path, not the contents it points at
+            from_git = git is not None and rel not in changed and not path.is_symlink()
+            blob = git.blob(rel) if from_git else None
+            if blob is None:
+                try:
+                    data = path.read_bytes()
+                except OSError:  # deleted since it was listed
+                    continue
+            else:
+                sha, data = blob
+                if cache is not None:
+                    keys[rel] = HandlerCache.key(sha, path)
+                    hit = cache.get(keys[rel])
+                    if hit is not None:
+                        handlers[rel] = from_cached(path, data, *hit)
+                        continue
+            todo.append(rel)
+            paths.append(path)
+            blobs.append(data)
+
+        # parsing is CPU-bound and independent per file
+        workers = os.cpu_count() or 1
+        if workers == 1 or len(todo) < self.PARALLEL_PARSE_MIN:
+            parsed = list(map(from_bytes, paths, blobs))
+        else:
+            # this runs on a pool thread: forking a threaded process can copy a
+            # lock another thread holds, so the workers come from a forkserver
+            ctx = multiprocessing.get_context("forkserver")
+            with concurrent.futures.ProcessPoolExecutor(workers, mp_context=ctx) as ex:
+                parsed = list(ex.map(from_bytes, paths, blobs, chunksize=16))
+        handlers.update(zip(todo, parsed))
+
+        if cache is not None:
+            cache.put_many(
+                (keys[rel], type(h).__name__, h.structure)
+                for rel, h in zip(todo, parsed)
+                if rel in keys
+            )
+            cache.close()
+        return {rel: handlers[rel] for rel in files if rel in handlers}
+
+    async def _open(self, name):
+        async with self._repo_locks[name]:
+            root = self.repos[name]
+            status_info, files = await self._cached_git(
+                name, "open", self._git_status_and_files, stale_ok=False
+            )
 
-            result["change_summary"] = (
-                f"Repository has uncommitted changes in {len(status_info['files'])} file(s): "
-                + "; ".join(file_summaries)
+            changed = {f["file"] for f in status_info["files"]}
+            # renames show as "old -> new"; both sides belong in the next commit
+            self._dirty[name] = {p for f in changed for p in f.split(" -> ")}
+            self.open_handlers[name] = await self._in_pool(
+                self._load_handlers, name, root, files, changed
+            )
+            self._py_handlers[name] = {
+                rel: h
+                for rel, h in self.open_handlers[name].items()
+                if rel.endswith(".py")
+            }
+            if self._py_handlers[name]:
+                # pylint start-up overlaps indexing instead of the first write
+                self._io_pool.submit(self.verifier.prewarm, root)
+            # Embedding every file is the slow part of open and only search needs
+            # it, so it runs in the background; _index_ready waits for it.
+            await self._index_settled(name)  # a re-open must not race the last build
+            self._index_tasks[name] = asyncio.create_task(
+                self._in_pool(
+                    self.indexer.index_repository,
+                    name,
+                    root,
+                    {k: h.structure for k, h in self.open_handlers[name].items()},
+                    {k: h.text for k, h in self.open_handlers[name].items()},
+                )
             )
 
-        return result
+            instructions = self._get_repo_instructions(name)
+            files = list(self.open_handlers[name])  # minus any deleted mid-load
+            result = {"opened": True, "files": files, "instructions": instructions}
+
+            if not status_info["clean"]:
+                result["change_in_progress"] = True
+                result["changed_files"] = status_info["files"]
+                file_summaries = []
+                for file_info in status_info["files"]:
+                    status_text = ", ".join(file_info["status"])
+                    file_summaries.append(f"{file_info['file']} ({status_text})")
+
+                result["change_summary"] = (
+                    f"Repository has uncommitted changes in {len(status_info['files'])} file(s): "
+                    + "; ".join(file_summaries)
+                )
 
-    def _close(self, name):
-        self.open_handlers.pop(name, None)
-        self.indexer.drop_repo(name)
-        self._active_changes.discard(name)
-        return {"closed": True}
+            return result
+
+    async def _index_settled(self, name: str):
+        """Let an in-flight index build finish, whatever its outcome."""
+        task = self._index_tasks.pop(name, None)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _close(self, name):
+        async with self._repo_locks[name]:
+            await self._index_settled(name)
+            self.open_handlers.pop(name, None)
+            self._py_handlers.pop(name, None)
+            self._dirty.pop(name, None)
+            self._invalidate_git(name)
+            self._outlines = {k: v for k, v in self._outlines.items() if k[0] != name}
+            git = self._git_procs.pop(name, None)
+            if git is not None:
+                git.close()
+            # may wait on a running lint for the root lock: off the event loop
+            await self._in_pool(self.verifier.close, self.repos[name])
+            # chunks stay in the persistent store: a re-open only re-indexes
+            # files that changed in between
+            self._active_changes.discard(name)
+            return {"closed": True}
 
     # ------------------------------------------------ tool registration
     def _register_handlers(self):
+        import mcp.types as types
+
         def schema(**props):
             return {"type": "object", "properties": props, "required": list(props)}
 
@@ -539,6 +988,10 @@ class PyProjectMCPServer:
                 ),
                 "Vector search in repo.",
             ),
+            "status": (
+                schema(name={"type": "string"}),
+                "Git status of the working tree, including untracked files.",
+            ),
             "update_instructions": (
                 schema(
                     name={"type": "string"},
@@ -548,6 +1001,38 @@ class PyProjectMCPServer:
             ),
         }
 
+        def update_instructions(a):
+            self._update_repo_instructions(a["name"], a["instructions"])
+            return {"updated": True, "instructions": a["instructions"]}
+
+        # tool name → handler(args); async handlers return awaitables. Anything
+        # that blocks (git, tests, pylint, indexing) is async and runs on
+        # _io_pool; the rest only touch in-memory state, so they stay inline
+        # on the loop and never race the async tools.
+        self._dispatch = {
+            "guidelines": lambda a: {"guidelines": guidelines_text},
+            "list_repositories": lambda a: self._list_repositories(),
+            "open_repository": lambda a: self._open(a["name"]),
+            "close_repository": lambda a: self._close(a["name"]),
+            "start_change": lambda a: self._start_change(a["name"]),
+            "end_change": lambda a: self._end_change(a["name"], a["message"]),
+            "outline": lambda a: self._outline(a["name"], a["reference"]),
+            "get": lambda a: self._get(a["name"], a["reference"]),
+            "write": lambda a: self._write(a["name"], a["reference"], a["content"]),
+            "delete": lambda a: self._delete(a["name"], a["reference"]),
+            "add": lambda a: self._add(
+                a["name"],
+                a["type"],
+                a["parent_reference"],
+                a["object_name"],
+                a["content"],
+            ),
+            "verify": lambda a: self._verify(a["name"], a["reference"]),
+            "search": lambda a: self._search(a["name"], a["query"], a.get("limit", 10)),
+            "status": lambda a: self._status(a["name"]),
+            "update_instructions": update_instructions,
+        }
+
         @self.server.list_tools()
         async def list_tools():
             return [
@@ -572,58 +1057,25 @@ class PyProjectMCPServer:
         @self.server.call_tool()
         async def call_tool(name: str, args: Any):
             try:
-                cmd = name.removeprefix("dazbuild_")
-                if cmd == "guidelines":
-                    res = {"guidelines": guidelines_text}
-                elif cmd == "list_repositories":
-                    res = self._list_repositories()
-                elif cmd == "open_repository":
-                    res = self._open(args["name"])
-                elif cmd == "close_repository":
-                    res = self._close(args["name"])
-                elif cmd == "start_change":
-                    res = self._start_change(args["name"])
-                elif cmd == "end_change":
-                    res = self._end_change(args["name"], args["message"])
-                elif cmd == "outline":
-                    res = self._outline(args["name"], args["reference"])
-                elif cmd == "get":
-                    res = self._get(args["name"], args["reference"])
-                elif cmd == "write":
-                    res = self._write(args["name"], args["reference"], args["content"])
-                elif cmd == "delete":
-                    res = self._delete(args["name"], args["reference"])
-                elif cmd == "add":
-                    res = self._add(
-                        args["name"],
-                        args["type"],
-                        args["parent_reference"],
-                        args["object_name"],
-                        args["content"],
-                    )
-                elif cmd == "verify":
-                    res = self._verify(args["name"], args["reference"])
-                elif cmd == "search":
-                    res = self._search(
-                        args["name"], args["query"], args.get("limit", 10)
-                    )
-                elif cmd == "update_instructions":
-                    self._update_repo_instructions(args["name"], args["instructions"])
-                    res = {"updated": True, "instructions": args["instructions"]}
-                else:
-                    res = {"error": f"Unknown tool {name}"}
-                return [types.TextContent(type="text", text=json.dumps(res, indent=2))]
+                fn = self._dispatch.get(name.removeprefix("dazbuild_"))
+                res = fn(args) if fn else {"error": f"Unknown tool {name}"}
+                if inspect.isawaitable(res):
+                    res = await res
+                return [types.TextContent(type="text", text=self._dumps(res))]
             except Exception as exc:
                 return [
                     types.TextContent(
                         type="text",
-                        text=json.dumps(
-                            {"error": str(exc), "trace": traceback.format_exc()},
-                            indent=2,
+                        text=self._dumps(
+                            {"error": str(exc), "trace": traceback.format_exc()}
                         ),
                     )
                 ]
 
+    @staticmethod
+    def _dumps(res: Any) -> str:
+        return orjson.dumps(res, option=orjson.OPT_INDENT_2).decode()
+
     # ------------------------------------------------ run loop
     async def run(self):
         try:
@@ -631,6 +1083,12 @@ class PyProjectMCPServer:
         except Exception as exc:
             print(f"Error loading config: {str(exc)}", file=sys.stderr)
             return
+        import mcp.server.stdio
+        from mcp.server import NotificationOptions, Server
+        from mcp.server.models import InitializationOptions
+
+        self.server = Server("daz-python-code-navigator")
+        self._register_handlers()
         async with mcp.server.stdio.stdio_server() as (r, w):
             await self.server.run(
                 r,
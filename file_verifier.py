@@ -25,61 +25,204 @@ The verify() method works in two modes:
 import json
 import os
 import re
+import select
 import shutil
+import signal
 import subprocess
 import sys
+import threading
 import time
 import traceback
+from collections import defaultdict, deque
 from concurrent.futures import (
     ThreadPoolExecutor,
     as_completed,
     TimeoutError as FutureTimeoutError,
 )
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, List, Optional, Set
+
+import orjson
 
 # Prevent tokenizer deadlocks when forking
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 # Prevent .pyc files during test runs
 os.environ["PYTHONDONTWRITEBYTECODE"] = "1"
 
+# Content rules, compiled once and run over raw bytes (no utf-8 decode)
+_MOCK_STUB = re.compile(rb"\b(mock|stub)\b", re.IGNORECASE)
+_UNITTEST_MAIN = re.compile(rb"unittest\.main")
+# any one of: TestCase reference, Test* class deriving from it, test_ function
+_HAS_TESTS = re.compile(
+    rb"(?i:\bunittest\.TestCase\b|class\s+\w*Test\w*\s*\([^)]*unittest\.TestCase)"
+    rb"|def\s+test_\w+\s*\("
+)
+_TESTCASE = re.compile(rb"\bTestCase\b", re.IGNORECASE)
+_KEYRING = re.compile(rb"\bkeyring\b", re.IGNORECASE)
+
 
 class FileVerifier:
     """Handles all file verification operations."""
 
     MAX_FILE_SIZE = 8192
+    # pylint errors/warnings kept per run; linting stops once this many are found
+    MAX_PYLINT_ISSUES = 20
+    # bytes of unittest output kept (the tail: summary and failures are last)
+    MAX_TEST_OUTPUT = 64 * 1024
 
     # Define code file extensions that need size checking
-    CODE_EXTENSIONS = {
-        ".py",
-        ".js",
-        ".ts",
-        ".jsx",
-        ".tsx",
-        ".java",
-        ".cpp",
-        ".c",
-        ".h",
-        ".hpp",
-        ".cs",
-        ".go",
-        ".rs",
-        ".rb",
-        ".php",
-        ".swift",
-        ".kt",
-        ".scala",
-        ".clj",
-        ".hs",
-        ".ml",
-        ".fs",
-        ".vb",
-        ".sql",
-    }
+    CODE_EXTENSIONS = frozenset(
+        {
+            ".py",
+            ".js",
+            ".ts",
+            ".jsx",
+            ".tsx",
+            ".java",
+            ".cpp",
+            ".c",
+            ".h",
+            ".hpp",
+            ".cs",
+            ".go",
+            ".rs",
+            ".rb",
+            ".php",
+            ".swift",
+            ".kt",
+            ".scala",
+            ".clj",
+            ".hs",
+            ".ml",
+            ".fs",
+            ".vb",
+            ".sql",
+        }
+    )
+
+    PYLINT_WORKER = Path(__file__).with_name("pylint_worker.py")
+    UNITTEST_RUNNER = Path(__file__).with_name("unittest_runner.py")
+    NO_TESTS = 5  # unittest_runner's exit status when nothing was collected
 
     def __init__(self):
         """Initialize the verifier."""
-        pass
+        # repo root -> long-lived pylint worker (see pylint_worker.py)
+        self._pylint_procs: Dict[str, subprocess.Popen] = {}
+        self._pylint_locks: Dict[str, threading.Lock] = {}
+        # repo root -> test / one-shot pylint runs in flight there (each
+        # leads its own session)
+        self._running: Dict[str, Set[subprocess.Popen]] = defaultdict(set)
+        # absolute path -> ((mtime_ns, size), basic-issue verdict)
+        self._scan_cache: Dict[str, tuple] = {}
+
+    def close(self, root: Path):
+        """Stop the pylint worker for a repository, if one is running.
+
+        Holds the root's lock so an in-flight lint or prewarm can't respawn
+        the worker behind our back; dropping the lock entry afterwards tells
+        anything still queued on it that the repository was closed."""
+        if not self._running.get(str(root), True):
+            del self._running[str(root)]
+        lock = self._pylint_locks.get(str(root))
+        if lock is None:
+            self._stop_worker(root)
+            return
+        with lock:
+            self._stop_worker(root)
+            self._pylint_locks.pop(str(root), None)
+
+    def _stop_worker(self, root: Path):
+        proc = self._pylint_procs.pop(str(root), None)
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+
+    def _root_lock(self, root: Path) -> threading.Lock:
+        return self._pylint_locks.setdefault(str(root), threading.Lock())
+
+    def _is_open(self, root: Path, lock: threading.Lock) -> bool:
+        """False once close() has retired `lock` (call with it held)."""
+        return self._pylint_locks.get(str(root)) is lock
+
+    def prewarm(self, root: Path):
+        """Start root's pylint worker ahead of the first lint (it imports
+        pylint/astroid on start-up, which takes a while)."""
+        lock = self._root_lock(root)
+        with lock:
+            if self._is_open(root, lock):
+                self._pylint_worker(root)
+
+    def cancel(self, root: Path):
+        """Kill root's test / pylint runs in flight, including their children.
+        Runs for other repositories are left alone."""
+        for proc in list(self._running.get(str(root), ())):
+            self._kill_group(proc)
+
+    @staticmethod
+    def _kill_group(proc: subprocess.Popen):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _run(
+        self,
+        cmd: List[str],
+        root: Path,
+        timeout: int,
+        text: bool = True,
+        tail: Optional[int] = None,
+    ):
+        """check_output() with stderr merged, run in a new session so a timeout
+        or cancel() kills the whole process group – children spawned by the
+        code under test can't outlive it or hold the output pipe open.
+
+        Output is read incrementally; with `tail` only roughly the last `tail`
+        bytes are kept (unittest's verdict and failures are at the end).
+        """
+        proc = subprocess.Popen(
+            cmd,
+            cwd=root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=-1,
+            start_new_session=True,
+        )
+        running = self._running[str(root)]
+        running.add(proc)
+        deadline = time.monotonic() + timeout
+        chunks: Deque[bytes] = deque()
+        kept = dropped = 0
+        try:
+            fd = proc.stdout.fileno()
+            while True:
+                left = deadline - time.monotonic()
+                if left <= 0 or not select.select([fd], [], [], left)[0]:
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+                chunk = os.read(fd, 1 << 16)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                kept += len(chunk)
+                while tail and kept - len(chunks[0]) >= tail:
+                    dropped += len(chunks[0])
+                    kept -= len(chunks.popleft())
+            proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            self._kill_group(proc)
+            proc.wait()
+            raise
+        finally:
+            proc.stdout.close()
+            running.discard(proc)
+        out = b"".join(chunks)
+        if dropped:
+            out = b"... [%d bytes of output dropped]\n" % dropped + out
+        if text:
+            out = out.decode("utf-8", errors="replace")
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, output=out)
+        return out
 
     def verify(
         self,
@@ -166,47 +309,61 @@ class FileVerifier:
                     }
 
             # Run project-wide checks
-            return self._verify_whole_project(root, diagnostics)
+            return self._verify_whole_project(root, diagnostics, all_files)
 
     def _check_file_basic_issues(self, root: Path, file: str) -> Dict[str, Any]:
-        """Check a single file for basic issues (mock/stub, size, test presence, keyring, unittest.main)."""
+        """Check a single file for basic issues (mock/stub, size, test presence, keyring, unittest.main).
+
+        Verdicts are cached per path against (mtime, size), so a file that
+        hasn't changed since the last run costs one stat() and no read.
+        """
+        if not (file.endswith(".py") or self._is_code_file(file)):
+            return {"success": True}
+        file_path = root / file
+        try:
+            st = file_path.stat()
+        except OSError:
+            return {"success": True}
+        stamp = (st.st_mtime_ns, st.st_size)
+        hit = self._scan_cache.get(str(file_path))
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        result = self._scan_file(file_path, file, st.st_size)
+        self._scan_cache[str(file_path)] = (stamp, result)
+        return result
+
+    def _scan_file(self, file_path: Path, file: str, file_size: int) -> Dict[str, Any]:
         if file.endswith(".py"):
             # Check for mock/stub
-            file_path = root / file
-            if file_path.exists():
-                content = file_path.read_text()
-                if re.search(r"\b(mock|stub)\b", content, re.IGNORECASE):
-                    return {
-                        "success": False,
-                        "error": "Mock objects, stub objects, or mock/stub tests are never allowed",
-                    }
+            content = file_path.read_bytes()  # one read serves every rule
+            if _MOCK_STUB.search(content):
+                return {
+                    "success": False,
+                    "error": "Mock objects, stub objects, or mock/stub tests are never allowed",
+                }
 
-                # Check for unittest.main
-                if "unittest.main" in content:
-                    return {
-                        "success": False,
-                        "error": "contains unittest.main() which is not allowed",
-                    }
+            # Check for unittest.main
+            if _UNITTEST_MAIN.search(content):
+                return {
+                    "success": False,
+                    "error": "contains unittest.main() which is not allowed",
+                }
 
-                # Check for test presence
-                if not self._has_tests(content):
-                    return {"success": False, "error": "No unit tests found in file"}
+            # Check for test presence
+            if not self._has_tests(content):
+                return {"success": False, "error": "No unit tests found in file"}
 
-                # Check for keyring in tests
-                keyring_check = self._check_keyring_in_tests(content)
-                if not keyring_check["success"]:
-                    return {"success": False, "error": keyring_check["error"]}
+            # Check for keyring in tests
+            keyring_check = self._check_keyring_in_tests(content)
+            if not keyring_check["success"]:
+                return {"success": False, "error": keyring_check["error"]}
 
         # Check file size for all code files
-        if self._is_code_file(file):
-            file_path = root / file
-            if file_path.exists():
-                file_size = file_path.stat().st_size
-                if file_size > self.MAX_FILE_SIZE:
-                    return {
-                        "success": False,
-                        "error": f"exceeds {self.MAX_FILE_SIZE} byte limit ({self._format_file_size(file_size)})",
-                    }
+        if self._is_code_file(file) and file_size > self.MAX_FILE_SIZE:
+            return {
+                "success": False,
+                "error": f"exceeds {self.MAX_FILE_SIZE} byte limit ({self._format_file_size(file_size)})",
+            }
 
         return {"success": True}
 
@@ -217,18 +374,23 @@ class FileVerifier:
         file_path = root / rel_path
 
         # 1. Check for mock/stub (all files)
-        if file_path.exists():
-            content = file_path.read_text()
-            if re.search(r"\b(mock|stub)\b", content, re.IGNORECASE):
-                return {
-                    "success": False,
-                    "error": "Mock objects, stub objects, or mock/stub tests are never allowed - all tests should test real functionality",
-                    "diagnostics": diagnostics,
-                }
+        try:
+            content = file_path.read_bytes()
+        except FileNotFoundError:
+            content = None
+        if content is not None and _MOCK_STUB.search(content):
+            return {
+                "success": False,
+                "error": "Mock objects, stub objects, or mock/stub tests are never allowed - all tests should test real functionality",
+                "diagnostics": diagnostics,
+            }
 
         # 2. Check file size (code files only)
         if self._is_code_file(rel_path):
-            file_size = file_path.stat().st_size
+            # the bytes are already in hand, so their length is the size
+            file_size = (
+                len(content) if content is not None else file_path.stat().st_size
+            )
             diagnostics["size_bytes"] = file_size
             if file_size > self.MAX_FILE_SIZE:
                 return {
@@ -261,7 +423,7 @@ class FileVerifier:
                 }
 
             # 4. Check for unittest.main
-            if "unittest.main" in content:
+            if _UNITTEST_MAIN.search(content):
                 return {
                     "success": False,
                     "error": "File contains unittest.main() which is not allowed",
@@ -281,7 +443,10 @@ class FileVerifier:
         return {"success": True, "diagnostics": diagnostics}
 
     def _verify_whole_project(
-        self, root: Path, diagnostics: Dict[str, Any]
+        self,
+        root: Path,
+        diagnostics: Dict[str, Any],
+        all_files: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """Run project-wide verification (unittest discover and pylint) in parallel."""
 
@@ -293,7 +458,9 @@ class FileVerifier:
             with ThreadPoolExecutor(max_workers=2) as executor:
                 # Submit both tasks
                 test_future = executor.submit(self._run_project_tests, root)
-                pylint_future = executor.submit(self._run_pylint_project, root)
+                pylint_future = executor.submit(
+                    self._run_pylint_project, root, all_files
+                )
 
                 # Track which tasks are running
                 diagnostics["tasks_started"] = ["project_tests", "project_pylint"]
@@ -337,32 +504,27 @@ class FileVerifier:
                 "diagnostics": {**diagnostics, "exception": traceback.format_exc()},
             }
 
-        # Check test results
-        if "tests" in results:
-            diagnostics.update(results["tests"]["diagnostics"])
-            if not results["tests"]["success"]:
-                return {
-                    "success": False,
-                    "error": results["tests"]["error"],
-                    "diagnostics": diagnostics,
-                }
-
-        # Check pylint results
-        if "pylint" in results:
-            diagnostics.update(results["pylint"]["diagnostics"])
-            if not results["pylint"]["success"]:
-                return {
-                    "success": False,
-                    "error": results["pylint"]["error"],
-                    "diagnostics": diagnostics,
-                }
+        # Check test and pylint results; keep both outputs even if one fails
+        errors = []
+        for key in ("tests", "pylint"):
+            if key in results:
+                diagnostics.update(results[key]["diagnostics"])
+                if not results[key]["success"]:
+                    errors.append(results[key]["error"])
+        if errors:
+            return {
+                "success": False,
+                "error": "; ".join(errors),
+                "diagnostics": diagnostics,
+            }
 
         diagnostics["total_verification_time"] = time.time() - start_time
         return {"success": True, "diagnostics": diagnostics}
 
     def _is_code_file(self, rel_path: str) -> bool:
         """Check if a file is a code file based on extension."""
-        return any(rel_path.endswith(ext) for ext in self.CODE_EXTENSIONS)
+        _, dot, ext = rel_path.rpartition(".")
+        return bool(dot) and f".{ext}" in self.CODE_EXTENSIONS
 
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in a human-readable way."""
@@ -373,26 +535,18 @@ class FileVerifier:
         else:
             return f"{size_bytes / (1024 * 1024):.1f} MB"
 
-    def _has_tests(self, content: str) -> bool:
+    def _has_tests(self, content: bytes) -> bool:
         """Check if Python file has tests."""
-        has_testcase = bool(re.search(r"\bunittest\.TestCase\b", content, re.I))
-        has_test_class = bool(
-            re.search(r"class\s+\w*Test\w*\s*\([^)]*unittest\.TestCase", content, re.I)
-        )
-        has_test_func = bool(re.search(r"def\s+test_\w+\s*\(", content))
-        return has_testcase or has_test_class or has_test_func
+        return _HAS_TESTS.search(content) is not None
 
-    def _check_keyring_in_tests(self, content: str) -> Dict[str, Any]:
+    def _check_keyring_in_tests(self, content: bytes) -> Dict[str, Any]:
         """Check if keyring is used in test code (after TestCase)."""
         # Find where TestCase appears in the file
-        testcase_match = re.search(r"\bTestCase\b", content, re.IGNORECASE)
+        testcase_match = _TESTCASE.search(content)
 
         if testcase_match:
-            # Get content after TestCase
-            content_after_testcase = content[testcase_match.end() :]
-
             # Check if keyring appears after TestCase
-            if re.search(r"\bkeyring\b", content_after_testcase, re.IGNORECASE):
+            if _KEYRING.search(content, testcase_match.end()):
                 return {
                     "success": False,
                     "error": "Tests should never access keyring - the word 'keyring' appears in test code",
@@ -403,7 +557,7 @@ class FileVerifier:
     def _run_file_tests(self, root: Path, rel_path: str) -> Dict[str, Any]:
         """Run unit tests for a single Python file."""
         file_path = root / rel_path
-        content = file_path.read_text()
+        content = file_path.read_bytes()
 
         # First check if the file has any tests
         if not self._has_tests(content):
@@ -422,22 +576,12 @@ class FileVerifier:
         # Run the tests
         try:
             module_path = rel_path.replace("/", ".").replace(".py", "")
-            output = subprocess.check_output(
-                [sys.executable, "-m", "unittest", module_path, "-v"],
-                cwd=root,
-                text=True,
-                stderr=subprocess.STDOUT,
+            output = self._run(
+                [sys.executable, str(self.UNITTEST_RUNNER), module_path],
+                root,
                 timeout=60,  # 60 second timeout
+                tail=self.MAX_TEST_OUTPUT,
             )
-
-            # Check if any tests were actually run
-            if "Ran 0 tests" in output:
-                return {
-                    "success": False,
-                    "error": "No tests were executed (Ran 0 tests)",
-                    "diagnostics": {"test_output": output},
-                }
-
             return {"success": True, "diagnostics": {"test_output": output}}
 
         except subprocess.TimeoutExpired:
@@ -447,6 +591,12 @@ class FileVerifier:
                 "diagnostics": {"test_error": "Tests exceeded timeout limit"},
             }
         except subprocess.CalledProcessError as exc:
+            if exc.returncode == self.NO_TESTS:
+                return {
+                    "success": False,
+                    "error": "No tests were executed (Ran 0 tests)",
+                    "diagnostics": {"test_output": exc.output},
+                }
             return {
                 "success": False,
                 "error": "Unit tests failed",
@@ -462,21 +612,12 @@ class FileVerifier:
     def _run_project_tests(self, root: Path) -> Dict[str, Any]:
         """Run all unit tests in the project."""
         try:
-            output = subprocess.check_output(
-                [sys.executable, "-m", "unittest", "discover", "-v", "-p", "*.py"],
-                cwd=root,
-                text=True,
-                stderr=subprocess.STDOUT,
+            output = self._run(
+                [sys.executable, str(self.UNITTEST_RUNNER)],
+                root,
                 timeout=300,  # 5 minute timeout for whole project
+                tail=self.MAX_TEST_OUTPUT,
             )
-
-            if "Ran 0 tests" in output:
-                return {
-                    "success": False,
-                    "error": "No tests discovered in project",
-                    "diagnostics": {"unittest_output": output},
-                }
-
             return {"success": True, "diagnostics": {"unittest_output": output}}
 
         except subprocess.TimeoutExpired:
@@ -486,30 +627,105 @@ class FileVerifier:
                 "diagnostics": {"unittest_error": "Tests exceeded timeout limit"},
             }
         except subprocess.CalledProcessError as exc:
+            if exc.returncode == self.NO_TESTS:
+                return {
+                    "success": False,
+                    "error": "No tests discovered in project",
+                    "diagnostics": {"unittest_output": exc.output},
+                }
             return {
                 "success": False,
                 "error": "Unit tests failed",
                 "diagnostics": {"unittest_failures": exc.output},
             }
 
-    def _run_pylint_file(self, root: Path, rel_path: str) -> Dict[str, Any]:
-        """Run pylint on a single Python file."""
+    def _pylint_worker(self, root: Path) -> Optional[subprocess.Popen]:
+        """Return the live pylint worker for root, spawning it on first use."""
+        proc = self._pylint_procs.get(str(root))
+        if proc is not None and proc.poll() is None:
+            return proc
+        try:
+            proc = subprocess.Popen(
+                [sys.executable, str(self.PYLINT_WORKER)],
+                cwd=root,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+            if not json.loads(proc.stdout.readline() or "{}").get("ready"):
+                proc.kill()
+                return None
+        except (OSError, ValueError):
+            return None
+        self._pylint_procs[str(root)] = proc
+        return proc
+
+    def _run_pylint(self, root: Path, args: List[str], timeout: int) -> List[Any]:
+        """Run pylint on args under root and return its error/warning messages.
+
+        At most MAX_PYLINT_ISSUES are returned. Uses the persistent worker;
+        falls back to a one-shot pylint process when pylint can't be imported
+        by this interpreter.
+        """
+        # Only errors/warnings count, so convention/refactor/info messages are
+        # disabled outright: pylint then skips checkers that can only emit
+        # those, and never formats or serialises messages we'd throw away.
+        args = ["--disable=C,R,I", *args]
+        lock = self._root_lock(root)
+        with lock:
+            # closed while we waited: lint one-shot rather than leave a worker
+            proc = self._pylint_worker(root) if self._is_open(root, lock) else None
+            if proc is not None:
+                try:
+                    request = {"args": args, "max_issues": self.MAX_PYLINT_ISSUES}
+                    proc.stdin.write(json.dumps(request) + "\n")
+                    proc.stdin.flush()
+                    ready, _, _ = select.select([proc.stdout], [], [], timeout)
+                    line = proc.stdout.readline() if ready else None
+                except OSError:
+                    line = ""
+                if line is None:
+                    self._stop_worker(root)  # a hung run would block the next one
+                    raise subprocess.TimeoutExpired(args, timeout)
+                resp = json.loads(line or '{"error": "pylint worker exited"}')
+                if "error" in resp:
+                    raise subprocess.CalledProcessError(1, args, output=resp["error"])
+                return resp["messages"]
+
         pylint_cmd = (
             ["pylint"] if shutil.which("pylint") else [sys.executable, "-m", "pylint"]
         )
-        pylint_cmd += ["-f", "json", "--exit-zero", rel_path]
-
         try:
-            pylint_json = subprocess.check_output(
-                pylint_cmd,
-                cwd=root,
-                text=True,
-                stderr=subprocess.STDOUT,
-                timeout=30,  # 30 second timeout per file
+            pylint_json = self._run(
+                pylint_cmd + ["-f", "json", "--exit-zero", *args],
+                root,
+                timeout=timeout,
+                text=False,
             )
+        except subprocess.CalledProcessError as exc:
+            if isinstance(exc.output, bytes):  # callers report it as diagnostics
+                exc.output = exc.output.decode("utf-8", "replace")
+            raise
+        issues = [
+            i
+            for i in orjson.loads(pylint_json or b"[]")
+            if i["type"] in {"error", "warning"}
+        ]
+        return issues[: self.MAX_PYLINT_ISSUES]
+
+    def _issue_count(self, issues: List[Any]) -> str:
+        """Issue count for messages; a full list means linting stopped early."""
+        if len(issues) >= self.MAX_PYLINT_ISSUES:
+            return f"{len(issues)}+"
+        return str(len(issues))
 
-            pylint_results = json.loads(pylint_json or "[]")
-            issues = [i for i in pylint_results if i["type"] in {"error", "warning"}]
+    def _run_pylint_file(self, root: Path, rel_path: str) -> Dict[str, Any]:
+        """Run pylint on a single Python file."""
+        try:
+            issues = self._run_pylint(
+                root, [rel_path], timeout=30
+            )  # 30 second timeout per file
 
             if issues:
                 # Format issues for readability
@@ -522,7 +738,7 @@ class FileVerifier:
 
                 return {
                     "success": False,
-                    "error": f"Pylint found {len(issues)} error(s)/warning(s)",
+                    "error": f"Pylint found {self._issue_count(issues)} error(s)/warning(s)",
                     "diagnostics": {
                         "pylint_issues": issues,
                         "pylint_summary": issue_summary,
@@ -541,36 +757,53 @@ class FileVerifier:
             return {
                 "success": False,
                 "error": f"Pylint invocation failed: {str(exc)}",
-                "diagnostics": {"pylint_error": str(exc)},
+                "diagnostics": {
+                    "pylint_error": getattr(exc, "output", None) or str(exc)
+                },
             }
 
-    def _run_pylint_project(self, root: Path) -> Dict[str, Any]:
+    def _pylint_targets(self, all_files: List[str]) -> List[str]:
+        """Top-level packages plus any modules that don't live in one.
+
+        Handing pylint whole packages lets astroid reuse what it has already
+        parsed across the package within a single run.
+        """
+        py_files = [rel for rel in all_files if rel.endswith(".py")]
+        init_dirs = {
+            rel.rpartition("/")[0] for rel in py_files if rel.endswith("__init__.py")
+        }
+        packages, loose = set(), []
+        for rel in py_files:
+            parts = rel.split("/")[:-1]
+            if parts and all(
+                "/".join(parts[: i + 1]) in init_dirs for i in range(len(parts))
+            ):
+                packages.add(parts[0])
+            else:
+                loose.append(rel)
+        return sorted(packages) + loose
+
+    def _run_pylint_project(
+        self, root: Path, all_files: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """Run pylint on the entire project."""
-        pylint_cmd = (
-            ["pylint"] if shutil.which("pylint") else [sys.executable, "-m", "pylint"]
-        )
-        pylint_cmd += ["-f", "json", "--exit-zero", "."]
+        targets = self._pylint_targets(all_files) if all_files else ["."]
+        if not targets:
+            return {"success": True, "diagnostics": {"pylint": []}}
 
         try:
-            pylint_json = subprocess.check_output(
-                pylint_cmd,
-                cwd=root,
-                text=True,
-                stderr=subprocess.STDOUT,
-                timeout=300,  # 5 minute timeout for whole project
-            )
-
-            pylint_results = json.loads(pylint_json or "[]")
-            issues = [i for i in pylint_results if i["type"] in {"error", "warning"}]
+            issues = self._run_pylint(
+                root, ["-j", "0", *targets], timeout=300
+            )  # 5 minute timeout for whole project
 
             if issues:
                 return {
                     "success": False,
-                    "error": f"Pylint reported {len(issues)} issue(s)",
-                    "diagnostics": {"pylint": pylint_results},
+                    "error": f"Pylint reported {self._issue_count(issues)} issue(s)",
+                    "diagnostics": {"pylint": issues},
                 }
 
-            return {"success": True, "diagnostics": {"pylint": pylint_results}}
+            return {"success": True, "diagnostics": {"pylint": issues}}
 
         except subprocess.TimeoutExpired:
             return {
@@ -582,5 +815,7 @@ class FileVerifier:
             return {
                 "success": False,
                 "error": "Pylint invocation failed",
-                "diagnostics": {"pylint_error": str(exc)},
+                "diagnostics": {
+                    "pylint_error": getattr(exc, "output", None) or str(exc)
+                },
             }
@@ -1,8 +1,20 @@
 # handler_base.py – common helpers + generic handler (char-accurate)
 
+import re
 import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+
+# str twins of FileVerifier's _UNITTEST_MAIN / _HAS_TESTS, so the parse-time
+# pre-check flags exactly what the verifier would; compiled once per process
+_ILLEGAL_MAIN = re.compile(r"unittest\.main")
+_HAS_TESTS = re.compile(
+    r"(?i:\bunittest\.TestCase\b|class\s+\w*Test\w*\s*\([^)]*unittest\.TestCase)"
+    r"|def\s+test_\w+\s*\("
+)
 
 
 # ----- helpers ---------------------------------------------------------------
@@ -10,46 +22,127 @@ def error(msg: str):
     print(msg, file=sys.stderr, flush=True)
 
 
-def chunk_text(text: str, size: int = 1024, overlap: int = 512):
-    for i in range(0, len(text), size - overlap):
+# (chunk, offset) windows; those starting before `start` are never sliced
+def chunk_text(text: str, size: int = 1024, overlap: int = 512, start: int = 0):
+    step = size - overlap
+    for i in range(-(-start // step) * step, len(text), step):
         yield text[i : i + size], i
 
 
+# reference "file::Class::method" → file + path of names inside it
+@dataclass(frozen=True, slots=True)
+class Ref:
+    file: str
+    path: Tuple[str, ...]
+
+
+# references are reused heavily (get → write on the same ref), so memoise
+@lru_cache(maxsize=4096)
+def parse_ref(ref: str) -> Ref:
+    f, *rest = ref.split("::", 1)
+    return Ref(f, tuple(rest[0].split("::")) if rest else ())
+
+
 # ----- core node -------------------------------------------------------------
 class Thing:
+    __slots__ = ("name", "_span", "children", "is_test")
+
     def __init__(self, name: str, span: Tuple[int, int]):
         self.name = name  # arbitrary identifier
         self.span = span  # (start_char, end_char) **inclusive**
         self.children: Dict[str, "Thing"] = {}
+        self.is_test = False  # Python test method / test function
+
+    # stored packed as start << 32 | end: one int object per node instead of
+    # a tuple and two ints (offsets fit 32 bits for files under 4 GiB)
+    @property
+    def span(self) -> Tuple[int, int]:
+        return self._span >> 32, self._span & 0xFFFFFFFF
 
+    @span.setter
+    def span(self, span: Tuple[int, int]):
+        self._span = span[0] << 32 | span[1]
+
+    # iterative: deep nesting can't hit the recursion limit
     def to_dict(self):
-        return {
-            "name": self.name,
-            "span": self.span,
-            "children": {k: v.to_dict() for k, v in self.children.items()},
-        }
+        out = {}
+        stack = [(self, out)]
+        while stack:
+            thing, d = stack.pop()
+            kids = {}
+            d["name"], d["span"], d["children"] = thing.name, thing.span, kids
+            for k, v in thing.children.items():
+                kids[k] = {}
+                stack.append((v, kids[k]))
+        return out
 
 
 # ----- abstract handler ------------------------------------------------------
 class BaseHandler:
+    # content flags used by end_change's fast pre-checks (Python files only)
+    has_unittest_main = False
+    has_tests = True
+    _index_root: Optional[Thing] = None  # structure that _index was built from
+
     # constructor
-    def __init__(self, fpath: Path, repo_root: Path):
+    def __init__(self, fpath: Path, repo_root: Path, text: Optional[str] = None):
         self.file_path = fpath
         self.repo_root = repo_root
-        self.text: str = fpath.read_text(encoding="utf-8", errors="ignore")
+        if text is None:
+            text = fpath.read_text(encoding="utf-8", errors="ignore")
+        self.text: str = text
+        # set from the text whichever handler parsed it, so a .py file that
+        # _reparse demotes to GenericHandler still carries current flags
+        if fpath.suffix == ".py":
+            self.has_unittest_main = bool(_ILLEGAL_MAIN.search(text))
+            self.has_tests = bool(_HAS_TESTS.search(text))
         self.structure: Thing = Thing(".", (0, len(self.text)))
+        # (start_char, end_char) regions edited since the last re-index
+        self.changed_spans: List[Tuple[int, int]] = []
+        self.version = 0  # bumped on every edit
 
     # low-level I/O
-    def _write_text(self, new_text: str):
+    def _write_text(self, new_text: str, span: Optional[Tuple[int, int]] = None):
         self.file_path.write_text(new_text, encoding="utf-8")
+        span = span or (0, len(new_text))
+        # everything outside the span is untouched, so the old end follows
+        # from the length change: (start, old_end, new_end) in characters
+        edit = (span[0], span[1] - (len(new_text) - len(self.text)), span[1])
         self.text = new_text  # keep cache in sync
-        self._reparse()  # rebuild hierarchy
+        spans = self.changed_spans + [span]
+        version = self.version + 1
+        self._reparse(edit)  # rebuild hierarchy
+        self.changed_spans = spans
+        self.version = version
+
+    def _append_text(self, content: str):
+        if not content.endswith("\n"):
+            content += "\n"
+        start = len(self.text)
+        self._write_text(self.text + "\n" + content, (start, start + 1 + len(content)))
+
+    # flat {path: Thing} over the current structure, built on first use and
+    # again whenever parse/_reparse/the handler cache swaps the structure
+    def _paths(self) -> Dict[Tuple[str, ...], Thing]:
+        if self._index_root is not self.structure:
+            index = {}
+            stack = [((), self.structure)]
+            while stack:
+                path, thing = stack.pop()
+                index[path] = thing
+                for name, child in thing.children.items():
+                    stack.append(((*path, name), child))
+            self._index, self._index_root = index, self.structure
+        return self._index
 
     # resolve reference → Thing
     def _resolve(self, ref: str) -> Thing:
-        parts = ref.split("::")[1:]  # drop filename
-        node = self.structure
-        for p in parts:
+        path = parse_ref(ref).path
+        node = self._paths().get(path)
+        if node is not None:
+            return node
+        node = self.structure  # miss: walk to name the first unknown piece
+        for p in path:
             if p not in node.children:
                 raise Exception(f"Unknown reference piece {p}")
             node = node.children[p]
@@ -63,27 +156,32 @@ class BaseHandler:
     def write(self, ref: str, content: str):
         t = self._resolve(ref)
         new = self.text[: t.span[0]] + content + self.text[t.span[1] :]
-        self._write_text(new)
+        self._write_text(new, (t.span[0], t.span[0] + len(content)))
 
     def add(self, parent: str, name: str, content: str):
         raise NotImplementedError
 
     # subclasses must implement parse -----------------------------------------
     @classmethod
-    def parse(cls, fpath: Path, root: Path) -> "BaseHandler":
+    def parse(
+        cls, fpath: Path, root: Path, text: Optional[str] = None
+    ) -> "BaseHandler":
         raise NotImplementedError
 
-    # helper: rebuild self in-place after edits
-    def _reparse(self):
-        fresh = get_handler_for(self.file_path)  # factory gives new concrete type
+    # helper: rebuild self in-place after edits; `edit` lets subclasses reparse
+    # incrementally. Parses self.text, which _write_text has just set, rather
+    # than reading back the file it has just written.
+    def _reparse(self, edit: Optional[Tuple[int, int, int]] = None):
+        # factory gives new concrete type
+        fresh = get_handler_for(self.file_path, self.text)
         self.__dict__.update(fresh.__dict__)  # shallow copy state
 
 
 # ----- generic fallback ------------------------------------------------------
 class GenericHandler(BaseHandler):
     @classmethod
-    def parse(cls, fpath: Path, root: Path):
-        h = cls(fpath, root)
+    def parse(cls, fpath: Path, root: Path, text: Optional[str] = None):
+        h = cls(fpath, root, text)
         h.structure.span = (0, len(h.text))
         return h
 
@@ -95,23 +193,50 @@ class GenericHandler(BaseHandler):
 # handler_base.py – factory excerpt only (rest unchanged)
 
 
-def get_handler_for(fpath: Path) -> BaseHandler:
+def _handler_types():
     from handler_python import PythonHandler
     from handler_js import JSHandler
     from handler_html import HTMLHandler
     from handler_css import CSSHandler
 
+    return PythonHandler, JSHandler, HTMLHandler, CSSHandler
+
+
+def get_handler_for(fpath: Path, text: Optional[str] = None) -> BaseHandler:
+    PythonHandler, JSHandler, HTMLHandler, CSSHandler = _handler_types()
+
     ext = fpath.suffix.lower()
     try:
         if ext == ".py":
-            return PythonHandler.parse(fpath, fpath.parent)
+            return PythonHandler.parse(fpath, fpath.parent, text)
         if ext in {".js", ".mjs", ".cjs"}:
-            return JSHandler.parse(fpath, fpath.parent)
+            return JSHandler.parse(fpath, fpath.parent, text)
         if ext in {".html", ".htm"}:
-            return HTMLHandler.parse(fpath, fpath.parent)
+            return HTMLHandler.parse(fpath, fpath.parent, text)
         if ext == ".css":
-            return CSSHandler.parse(fpath, fpath.parent)
+            return CSSHandler.parse(fpath, fpath.parent, text)
     except Exception as exc:  # ← swallow parser failures
         error(f"Parser failed for {fpath}: {exc}")
 
-    return GenericHandler.parse(fpath, fpath.parent)
+    return GenericHandler.parse(fpath, fpath.parent, text)
+
+
+# build a handler from raw file bytes (e.g. a git blob) without touching disk
+# same text read_text() yields: universal newlines, undecodable bytes dropped
+def _decode(data: bytes) -> str:
+    text = data.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def from_bytes(fpath: Path, data: bytes) -> BaseHandler:
+    return get_handler_for(fpath, _decode(data))
+
+
+# rebuild a handler from bytes plus a previously parsed structure (no parse)
+def from_cached(fpath: Path, data: bytes, kind: str, structure: Thing) -> BaseHandler:
+    types = {t.__name__: t for t in (*_handler_types(), GenericHandler)}
+    h = types[kind](fpath, fpath.parent, _decode(data))
+    h.structure = structure
+    return h
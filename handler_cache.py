@@ -0,0 +1,61 @@
+# handler_cache.py – on-disk cache of parsed handler structure, keyed by blob SHA
+#
+# A git blob SHA pins a file's exact content, so the Thing tree parsed from it
+# never goes stale. Entries are keyed by "<sha>:<ext>" because the extension
+# picks the handler. Bump CACHE_VERSION whenever Thing or a handler's parse
+# output changes shape.
+
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Optional, Tuple
+
+CACHE_VERSION = 7
+CACHE_ROOT = Path("~/.cache/daz-mcp").expanduser()
+
+
+class HandlerCache:
+    def __init__(self, repo: str):
+        path = CACHE_ROOT / repo / f"handlers-v{CACHE_VERSION}.sqlite"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS handlers (key TEXT PRIMARY KEY, payload BLOB)"
+        )
+
+    # None when the cache directory/database is unusable (read-only home, ...)
+    @classmethod
+    def open(cls, repo: str) -> Optional["HandlerCache"]:
+        try:
+            return cls(repo)
+        except (OSError, sqlite3.Error):
+            return None
+
+    @staticmethod
+    def key(sha: str, fpath: Path) -> str:
+        return f"{sha}:{fpath.suffix.lower()}"
+
+    # → (handler class name, structure) or None
+    def get(self, key: str) -> Optional[Tuple[str, Any]]:
+        row = self.db.execute(
+            "SELECT payload FROM handlers WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])
+        except Exception:  # corrupt / incompatible entry → treat as a miss
+            return None
+
+    def put_many(self, items: Iterable[Tuple[str, str, Any]]):
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO handlers VALUES (?, ?)",
+                (
+                    (key, pickle.dumps((kind, structure)))
+                    for key, kind, structure in items
+                ),
+            )
+
+    def close(self):
+        self.db.close()
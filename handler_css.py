@@ -2,6 +2,7 @@
 
 import re
 from pathlib import Path
+from typing import Optional
 from handler_base import BaseHandler, Thing
 
 
@@ -10,16 +11,20 @@ _rule = re.compile(r"([^{]+)\{")  # naive: selector till first '{'
 
 class CSSHandler(BaseHandler):
     @classmethod
-    def parse(cls, fpath: Path, root: Path):
-        h = cls(fpath, root)
+    def parse(cls, fpath: Path, root: Path, text: Optional[str] = None):
+        h = cls(fpath, root, text)
         text = h.text
-        matches = [(m.group(1).strip(), m.start()) for m in _rule.finditer(text)]
         h.structure.span = (0, len(text))
-        for (name, start), nxt in zip(matches, matches[1:] + [(None, len(text))]):
-            h.structure.children[name] = Thing(name, (start, nxt[1]))
+        children = h.structure.children
+        # each rule runs until the next one starts (the last one to EOF)
+        prev = None
+        for m in _rule.finditer(text):
+            if prev is not None:
+                children[prev[0]] = Thing(prev[0], (prev[1], m.start()))
+            prev = (m.group(1).strip(), m.start())
+        if prev is not None:
+            children[prev[0]] = Thing(prev[0], (prev[1], len(text)))
         return h
 
     def add(self, parent: str, name: str, content: str):
-        if not content.endswith("\n"):
-            content += "\n"
-        self._write_text(self.text + "\n" + content)
+        self._append_text(content)
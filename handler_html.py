@@ -1,36 +1,147 @@
 # handler_html.py – char-offset HTML id mapper
 
+import html
+import re
 from html.parser import HTMLParser
+from itertools import accumulate
 from pathlib import Path
+from typing import Dict, List, Optional
 
 from handler_base import BaseHandler, Thing
 
+try:
+    from lxml import etree
+except ImportError:  # optional: fall back to the pure-Python html.parser
+    etree = None
+
+
+# start offset of every line, counted on "\n" as both parsers do
+def _line_starts(text: str) -> List[int]:
+    return [0, *accumulate(len(ln) + 1 for ln in text.split("\n"))]
+
 
 class _PosParser(HTMLParser):
-    def __init__(self):
+    def __init__(self, lines: List[int]):
         super().__init__()
         self.ids = {}  # id -> absolute char offset
+        self.lines = lines
 
     def handle_starttag(self, _tag, attrs):
         for k, v in attrs:
             if k.lower() == "id":
-                # position of '<' is current offset
-                self.ids[v] = self.getpos()[1] + self.get_offset()
+                # getpos() is (line, column) of the tag's '<'
+                line, col = self.getpos()
+                self.ids[v] = self.lines[line - 1] + col
+
+
+_MAX_SOURCELINE = 65535
+_TAG_RES: Dict[str, re.Pattern] = {}
+_CLOSE_RES: Dict[str, re.Pattern] = {}
+
+# a whole start tag from its '<': quoted values may contain '<' and '>'
+_START_TAG = re.compile(
+    r"""<[^\s/>]+(?:[\s/]+[^\s/>=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]*))?)*\s*/?>"""
+)
+_ATTR = re.compile(r"""([^\s/>=]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>]*))?""")
+# content is text, not markup: a "<div>" inside is never an element
+_RAW_TEXT = frozenset(("script", "style", "textarea", "title", "xmp"))
+
+
+def _tag_re(tag: str) -> re.Pattern:
+    pat = _TAG_RES.get(tag)
+    if pat is None:
+        pat = _TAG_RES[tag] = re.compile(rf"<{re.escape(tag)}[\s/>]", re.I)
+    return pat
+
+
+def _close_re(tag: str) -> re.Pattern:
+    pat = _CLOSE_RES.get(tag)
+    if pat is None:
+        pat = _CLOSE_RES[tag] = re.compile(rf"</{re.escape(tag)}\s*>", re.I)
+    return pat
+
+
+# does the start tag `tag` carry id="id_"? (attributes begin at `start`)
+def _has_id(tag: str, start: int, id_: str) -> bool:
+    for m in _ATTR.finditer(tag, start):
+        if m.group(1).lower() == "id" and m.group(2) is not None:
+            value = m.group(2)
+            if value and value[0] in "\"'":
+                value = value[1:-1]
+            if html.unescape(value) == id_:
+                return True
+    return False
+
 
-    # patch: expose private offset
-    def get_offset(self):
-        return self.rawdata[: self.getpos()[1]].rfind("<")
+# libxml2 does the tokenizing in C, but only reports the line a start tag
+# ends on: the '<' is the next "<tag" after the previous node's, no later
+# than that line. Elements the parser implied (html, body, tbody, ...) have
+# no such tag in range and are skipped. A candidate for an element with an
+# id must be a start tag carrying that id, and comments, attribute values and
+# raw-text element bodies are stepped over, so markup-looking text is never
+# taken for the element. None when an id can't be placed that way; the
+# caller then falls back to html.parser.
+def _lxml_ids(text: str, lines: List[int]) -> Optional[Dict[str, int]]:
+    root = etree.fromstring(text.encode("utf8"), etree.HTMLParser(encoding="utf-8"))
+    ids = {}
+    if root is None:
+        return ids
+    pos = 0
+    for node in root.getroottree().iter():
+        if node.sourceline is None:
+            continue
+        if node.sourceline < _MAX_SOURCELINE:
+            end = lines[min(node.sourceline, len(lines) - 1)]
+        else:  # libxml2 stores line numbers in 16 bits; they stick at the cap
+            end = len(text)
+        if node.tag is etree.Comment:
+            start = text.find("<!--", pos, end)
+            if start != -1:
+                close = text.find("-->", start + 4)
+                pos = close + 3 if close != -1 else len(text)
+            continue
+        if not isinstance(node.tag, str):  # processing instruction, entity
+            continue
+        id_ = node.get("id")
+        found = tag = None
+        for m in _tag_re(node.tag).finditer(text, pos, end):
+            tag = _START_TAG.match(text, m.start())
+            if id_ is None or (
+                tag is not None and _has_id(tag.group(), len(node.tag) + 1, id_)
+            ):
+                found = m.start()
+                break
+        if found is None:
+            if id_ is not None:
+                return None
+            continue
+        pos = tag.end() if tag is not None else found + 1
+        if node.tag.lower() in _RAW_TEXT:
+            close = _close_re(node.tag).search(text, pos)
+            pos = close.end() if close is not None else len(text)
+        if id_ is not None:
+            ids[id_] = found
+    return ids
 
 
 class HTMLHandler(BaseHandler):
     @classmethod
-    def parse(cls, fpath: Path, root: Path):
-        h = cls(fpath, root)
+    def parse(cls, fpath: Path, root: Path, text: Optional[str] = None):
+        h = cls(fpath, root, text)
         text = h.text
-        parser = _PosParser()
-        parser.feed(text)
+        lines = _line_starts(text)
+        ids = None
+        if etree is not None:
+            try:
+                ids = _lxml_ids(text, lines)
+            except (etree.LxmlError, ValueError):
+                ids = None
+        if ids is None:
+            parser = _PosParser(lines)
+            parser.feed(text)
+            ids = parser.ids
         h.structure.span = (0, len(text))
-        for id_, start in parser.ids.items():
+        for id_, start in ids.items():
             # naive end = next '<' or EOF
             nxt = text.find("<", start + 1)
             end = nxt if nxt != -1 else len(text)
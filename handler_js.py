@@ -1,6 +1,7 @@
 # handler_js.py – robust Tree-sitter handler for JavaScript / TypeScript
 
 from pathlib import Path
+from typing import Optional
 
 from tree_sitter import Parser
 
@@ -25,38 +26,101 @@ def _parser() -> Parser:
 
 
 # --------------------------------------------------------------------------- #
-#  DFS walk
+#  DFS walk – a TreeCursor keeps traversal state on the C side instead of
+#  materialising node.children lists at every level. Nodes whose type is in
+#  `prune` are yielded but not descended into.
 # --------------------------------------------------------------------------- #
-def _walk(node):
-    yield node
-    for child in node.children:
-        yield from _walk(child)
+def _walk(tree, prune=frozenset()):
+    cursor = tree.walk()
+    while True:
+        node = cursor.node
+        yield node
+        if node.type not in prune and cursor.goto_first_child():
+            continue
+        if cursor.goto_next_sibling():
+            continue
+        while True:
+            if not cursor.goto_parent():
+                return
+            if cursor.goto_next_sibling():
+                break
+
+
+def _children(node):
+    cursor = node.walk()
+    if cursor.goto_first_child():
+        yield cursor.node
+        while cursor.goto_next_sibling():
+            yield cursor.node
+
+
+# declarations we record whole; nothing inside them is walked (class
+# members are read straight off the class body below)
+_OPAQUE = frozenset(("function_declaration", "class_declaration"))
+
+
+# (row, column) of a byte offset, as tree-sitter counts them
+def _point(data: bytes, offset: int):
+    return data.count(b"\n", 0, offset), offset - (data.rfind(b"\n", 0, offset) + 1)
 
 
 # --------------------------------------------------------------------------- #
 #  Concrete handler
 # --------------------------------------------------------------------------- #
 class JSHandler(BaseHandler):
+    _tree = None  # last syntax tree, kept for incremental reparses
+
     @classmethod
-    def parse(cls, fpath: Path, root: Path):
-        h = cls(fpath, root)
+    def parse(cls, fpath: Path, root: Path, text: Optional[str] = None):
+        h = cls(fpath, root, text)
         text_bytes = h.text.encode("utf8")
-        tree = _parser().parse(text_bytes)
-        root_node = tree.root_node
+        h._build(_parser().parse(text_bytes), text_bytes)
+        return h
 
-        h.structure.span = (0, len(text_bytes))
+    # trees can't be pickled (process pool, handler cache); drop it instead
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_tree", None)
+        state.pop("_bytes", None)
+        return state
+
+    # reuse the old tree: tree-sitter only re-lexes/re-parses around the edit
+    def _reparse(self, edit=None):
+        old = self._tree
+        if old is None or edit is None:
+            return super()._reparse()
+        start, _, new_end = edit
+        new_bytes = self.text.encode("utf8")
+        old_bytes = self._bytes
+        start_byte = len(self.text[:start].encode("utf8"))
+        new_end_byte = len(self.text[:new_end].encode("utf8"))
+        old_end_byte = new_end_byte - (len(new_bytes) - len(old_bytes))
+        old.edit(
+            start_byte=start_byte,
+            old_end_byte=old_end_byte,
+            new_end_byte=new_end_byte,
+            start_point=_point(new_bytes, start_byte),
+            old_end_point=_point(old_bytes, old_end_byte),
+            new_end_point=_point(new_bytes, new_end_byte),
+        )
+        self.structure = Thing(".", (0, len(self.text)))
+        self._build(_parser().parse(new_bytes, old), new_bytes)
+
+    def _build(self, tree, text_bytes: bytes):
+        self._tree, self._bytes = tree, text_bytes
+        self.structure.span = (0, len(text_bytes))
 
         def add_thing(parent: Thing, name: str, n):
             parent.children[name] = Thing(name, (n.start_byte, n.end_byte))
 
-        for node in _walk(root_node):
+        for node in _walk(tree, _OPAQUE):
             if node.type == "function_declaration":
                 name_node = node.child_by_field_name("name")
                 if name_node:
                     name = text_bytes[name_node.start_byte : name_node.end_byte].decode(
                         "utf8"
                     )
-                    add_thing(h.structure, name, node)
+                    add_thing(self.structure, name, node)
 
             elif node.type == "class_declaration":
                 name_node = node.child_by_field_name("name")
@@ -66,7 +130,7 @@ class JSHandler(BaseHandler):
                     ].decode("utf8")
                     cls_thing = Thing(cls_name, (node.start_byte, node.end_byte))
                     body = node.child_by_field_name("body")
-                    for m in body.children if body else []:
+                    for m in _children(body) if body else ():
                         if m.type == "method_definition":
                             id_node = m.child_by_field_name("name")
                             if id_node:
@@ -76,12 +140,8 @@ class JSHandler(BaseHandler):
                                 cls_thing.children[m_name] = Thing(
                                     m_name, (m.start_byte, m.end_byte)
                                 )
-                    h.structure.children[cls_name] = cls_thing
-
-        return h
+                    self.structure.children[cls_name] = cls_thing
 
     # append new top-level construct at end-of-file
     def add(self, parent: str, name: str, content: str):
-        if not content.endswith("\n"):
-            content += "\n"
-        self._write_text(self.text + "\n" + content)
+        self._append_text(content)
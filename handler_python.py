@@ -1,68 +1,89 @@
 # handler_python.py – AST handler that tags tests, functions, classes
 
 import ast
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 from handler_base import BaseHandler, GenericHandler, Thing
 
 
 # line→absolute-char helpers
+# start offset of every line; map/accumulate keep the per-line work in C
 def _line_offsets(text: str) -> List[int]:
-    offs = [0]
-    for ln in text.splitlines(keepends=True):
-        offs.append(offs[-1] + len(ln))
-    return offs
+    return [0, *accumulate(map(len, text.splitlines(keepends=True)))]
 
 
 def _abs(line: int, col: int, offs: List[int]) -> int:
     return offs[line - 1] + col
 
 
+# recent parses by content: a no-op write, an undo or a re-open parses text
+# seen before. str hashes are computed in C and cached on the string, and a
+# hit compares contents with memcmp; both far cheaper than ast.parse. The
+# trees are only read, never mutated, so sharing them is safe. Kept small:
+# an AST is tens of times the size of its source.
+@lru_cache(maxsize=32)
+def _parse(text: str) -> Optional[ast.Module]:
+    try:
+        return ast.parse(text)
+    except SyntaxError:
+        return None
+
+
+def _span(node: ast.AST, offs: List[int]) -> Tuple[int, int]:
+    return (
+        _abs(node.lineno, node.col_offset, offs),
+        _abs(node.end_lineno, node.end_col_offset, offs),
+    )
+
+
+def _add_function(parent: Thing, node: ast.AST, offs: List[int]):
+    parent.children[node.name] = Thing(node.name, _span(node, offs))
+
+
+def _add_class(parent: Thing, node: ast.ClassDef, offs: List[int]):
+    cls_thing = Thing(node.name, _span(node, offs))
+    # Test class detection (inherits TestCase or name starts with Test)
+    is_test_cls = node.name.startswith("Test") or any(
+        getattr(b, "id", "") == "TestCase" for b in node.bases
+    )
+    for sub in node.body:
+        if type(sub) in _FUNCTION_TYPES:
+            _add_function(cls_thing, sub, offs)
+            if is_test_cls and sub.name.startswith("test"):
+                cls_thing.children[sub.name].is_test = True  # mark
+    parent.children[node.name] = cls_thing
+
+
+# exact node type → collector; a dict lookup on type(node) instead of an
+# isinstance chain per top-level statement
+_FUNCTION_TYPES = frozenset((ast.FunctionDef, ast.AsyncFunctionDef))
+_DISPATCH = {
+    ast.FunctionDef: _add_function,
+    ast.AsyncFunctionDef: _add_function,
+    ast.ClassDef: _add_class,
+}
+
+
 class PythonHandler(BaseHandler):
     @classmethod
-    def parse(cls, fpath: Path, root: Path):
-        h = cls(fpath, root)
+    def parse(cls, fpath: Path, root: Path, text: Optional[str] = None):
+        h = cls(fpath, root, text)
         text = h.text
         offs = _line_offsets(text)
 
         h.structure.span = (0, len(text))
-        try:
-            tree = ast.parse(text)
-        except SyntaxError:
+        tree = _parse(text)
+        if tree is None:
             # invalid Python → fallback
-            return GenericHandler.parse(fpath, root)
-
-        def add_thing(parent: Thing, name: str, node: ast.AST):
-            parent.children[name] = Thing(
-                name,
-                (
-                    _abs(node.lineno, node.col_offset, offs),
-                    _abs(node.end_lineno, node.end_col_offset, offs),
-                ),
-            )
+            return GenericHandler.parse(fpath, root, text)
 
         for node in tree.body:
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                add_thing(h.structure, node.name, node)
-            elif isinstance(node, ast.ClassDef):
-                cls_thing = Thing(
-                    node.name,
-                    (
-                        _abs(node.lineno, node.col_offset, offs),
-                        _abs(node.end_lineno, node.end_col_offset, offs),
-                    ),
-                )
-                # Test class detection (inherits TestCase or name starts with Test)
-                is_test_cls = node.name.startswith("Test") or any(
-                    getattr(b, "id", "") == "TestCase" for b in node.bases
-                )
-                for sub in node.body:
-                    if isinstance(sub, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        add_thing(cls_thing, sub.name, sub)
-                        if is_test_cls and sub.name.startswith("test"):
-                            cls_thing.children[sub.name].is_test = True  # mark
-                h.structure.children[node.name] = cls_thing
+            add = _DISPATCH.get(type(node))
+            if add is not None:
+                add(h.structure, node, offs)
         # mark top-level test_ functions
         for child in h.structure.children.values():
             if child.name.startswith("test_"):
@@ -71,6 +92,4 @@ class PythonHandler(BaseHandler):
 
     # append new code at EOF
     def add(self, parent: str, name: str, content: str):
-        if not content.endswith("\n"):
-            content += "\n"
-        self._write_text(self.text + "\n" + content)
+        self._append_text(content)
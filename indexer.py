@@ -1,69 +1,246 @@
 # indexer.py – vector index backed by ChromaDB (character-accurate)
 
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import chromadb
-from chromadb.config import Settings
+import orjson
+from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
 
 from handler_base import chunk_text
 
+# --------------------------------------------------------------------------- #
+#  Open the on-disk store once per process
+# --------------------------------------------------------------------------- #
+_DB_PATH = Path.cwd() / "chroma_db"
+_CLIENT: Optional[chromadb.ClientAPI] = None
+
+
+def _client() -> chromadb.ClientAPI:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = chromadb.PersistentClient(
+            path=str(_DB_PATH),
+            settings=chromadb.Settings(anonymized_telemetry=False),
+        )
+    return _CLIENT
+
+
+# Chroma's default embedding function builds a new ONNXMiniLM_L6_V2 on every
+# call, reloading the tokenizer and ONNX session for each add and query. One
+# instance per process keeps both loaded (same model, same vectors).
+_EMBED: Optional[ONNXMiniLM_L6_V2] = None
+
+
+def _embedder() -> ONNXMiniLM_L6_V2:
+    global _EMBED
+    if _EMBED is None:
+        _EMBED = ONNXMiniLM_L6_V2()
+    return _EMBED
+
 
 # --------------------------------------------------------------------------- #
 #  ChromaDB wrapper
 # --------------------------------------------------------------------------- #
 class CodeIndexer:
-    # constructor: create/retrieve the collection
-    def __init__(self):
-        self.cli = chromadb.Client(
-            Settings(
-                persist_directory=str(Path.cwd() / "chroma_db"),
-                anonymized_telemetry=False,
-            )
-        )
+    # chars per chunk / shared between neighbours. The default model reads
+    # ~256 tokens (~1000 chars of code), so longer chunks would be cut off;
+    # the overlap only has to keep a definition that straddles a boundary
+    # whole in one of the two chunks.
+    CHUNK_SIZE = 1024
+    CHUNK_OVERLAP = 128
+    # chunks per col.add: one embedding batch + one write, across files
+    BATCH_SIZE = 256
+    # threads reading files the caller didn't supply text for
+    READ_WORKERS = 8
+
+    # constructor: retrieve (or create) the collection on the shared client
+    def __init__(
+        self, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP
+    ):
+        self.chunk_size, self.chunk_overlap = chunk_size, chunk_overlap
+        self.cli = _client()
+        self.col = self.cli.get_or_create_collection("code_chunks")
+        # embeddings are computed here and handed to Chroma, not left to the
+        # collection's configured (default) function
+        self._embed = _embedder()
+        # repo -> {rel: digest of the text its chunks were built from}. Kept
+        # inside chroma_db so it can't outlive the chunks it describes.
+        self._hashes_path = _DB_PATH / "hashes.json"
+        self._hashes_lock = threading.Lock()
         try:
-            self.col = self.cli.get_collection("code_chunks")
-        except Exception:
-            self.col = self.cli.create_collection("code_chunks")
+            self._hashes: Dict[str, Dict[str, str]] = orjson.loads(
+                self._hashes_path.read_bytes()
+            )
+        except (OSError, orjson.JSONDecodeError):
+            self._hashes = {}
 
     # ----------------------------------------------------------------------- #
     #  Helpers
     # ----------------------------------------------------------------------- #
-    def _add_file(self, repo: str, abs_path: Path, rel: str):
-        text = abs_path.read_text(encoding="utf-8", errors="ignore")
-        docs, metas, ids = [], [], []
-        for chunk, off in chunk_text(text):
+    def _chunks(self, repo: str, rel: str, text: str, start: int, out: tuple):
+        docs, metas, ids = out
+        # every meta dict points at the same repo/rel objects already; only
+        # the id prefix was being rebuilt per chunk
+        prefix = f"{repo}:{rel}:"
+        for chunk, off in chunk_text(text, self.chunk_size, self.chunk_overlap, start):
             docs.append(chunk)
             metas.append({"repo": repo, "file": rel, "offset": off})
-            ids.append(f"{repo}:{rel}:{off}")
-        if docs:
-            self.col.add(documents=docs, metadatas=metas, ids=ids)
+            ids.append(prefix + str(off))
+
+    @staticmethod
+    def _read(abs_path: Path) -> str:
+        return abs_path.read_text(encoding="utf-8", errors="ignore")
+
+    # covers the chunking too: new sizes make every file look changed
+    def _digest(self, text: str) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{self.chunk_size}/{self.chunk_overlap}:".encode())
+        h.update(text.encode())
+        return h.hexdigest()
+
+    # write-then-rename, so a crash leaves the old file rather than half a new one
+    def _save_hashes(self):
+        with self._hashes_lock:
+            data = orjson.dumps(self._hashes)
+        tmp = self._hashes_path.with_suffix(".tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, self._hashes_path)
+        except OSError:
+            pass  # only costs a full re-index next time
+
+    # drop each file's chunks from its cutoff offset on ({rel: cutoff}) in as
+    # few deletes as possible: files sharing a cutoff share one $in clause
+    def _delete_from(self, repo: str, cutoffs: Dict[str, int]):
+        by_cutoff: Dict[int, List[str]] = {}
+        for rel, cutoff in cutoffs.items():
+            by_cutoff.setdefault(cutoff, []).append(rel)
+        clauses = []
+        for cutoff, rels in by_cutoff.items():
+            for i in range(0, len(rels), self.BATCH_SIZE):
+                clause = {"file": {"$in": rels[i : i + self.BATCH_SIZE]}}
+                if cutoff:
+                    clause = {"$and": [clause, {"offset": {"$gte": cutoff}}]}
+                clauses.append(clause)
+        for i in range(0, len(clauses), self.BATCH_SIZE):
+            batch = clauses[i : i + self.BATCH_SIZE]
+            files = batch[0] if len(batch) == 1 else {"$or": batch}
+            self.col.delete(where={"$and": [{"repo": repo}, files]})
+
+    # add buffered chunks once a batch has built up (or whatever is left)
+    def _flush(self, out: tuple, force: bool = False):
+        docs, metas, ids = out
+        if docs and (force or len(docs) >= self.BATCH_SIZE):
+            self.col.add(
+                ids=ids, embeddings=self._embed(docs), documents=docs, metadatas=metas
+            )
+            for buf in out:
+                buf.clear()
+
+    # first chunk offset an edit can have touched: every chunk window that
+    # ends before the earliest edited offset is byte-for-byte unchanged
+    def _cutoff(self, spans: List[Tuple[int, int]]) -> int:
+        if not spans:
+            return 0
+        step = self.chunk_size - self.chunk_overlap
+        first = min(s for s, _ in spans)
+        return max(0, ((first - self.chunk_size) // step + 1) * step)
 
     # ----------------------------------------------------------------------- #
     #  Public API
     # ----------------------------------------------------------------------- #
-    # bulk index when repo opens
-    def index_repository(self, repo: str, root: Path, structs: Dict[str, Any]):
-        self.col.delete(where={"repo": repo})
-        for rel in structs:
-            self._add_file(repo, root / rel, rel)
-
-    # re-index one file after write/add
-    def update_file(self, repo: str, root: Path, rel: str):
-        # New: conform to strict filter requirement (single operator key)
-        self.col.delete(
-            where={
-                "$and": [
-                    {"repo": repo},
-                    {"file": rel},
-                ]
-            }
-        )
-        self._add_file(repo, root / rel, rel)
+    # bulk index when repo opens: only files whose content differs from what
+    # was last indexed are re-chunked (everything, the first time)
+    # (texts: rel -> content already in memory; files not in it are read)
+    def index_repository(
+        self,
+        repo: str,
+        root: Path,
+        structs: Dict[str, Any],
+        texts: Optional[Dict[str, str]] = None,
+    ):
+        texts = dict(texts or {})
+        missing = [rel for rel in structs if rel not in texts]
+        if missing:  # overlap the reads; chunking itself is just slicing
+            with ThreadPoolExecutor(max_workers=self.READ_WORKERS) as pool:
+                texts.update(
+                    zip(missing, pool.map(self._read, (root / rel for rel in missing)))
+                )
+        digests = {rel: self._digest(texts[rel]) for rel in structs}
+        known = self._hashes.get(repo)
+        if known is None:
+            self.col.delete(where={"repo": repo})
+            changed = list(structs)
+        else:
+            changed = [rel for rel, d in digests.items() if known.get(rel) != d]
+            gone = [rel for rel in known if rel not in digests]
+            self._delete_from(repo, dict.fromkeys(changed + gone, 0))
+        out = ([], [], [])
+        for rel in changed:
+            self._chunks(repo, rel, texts[rel], 0, out)
+            self._flush(out)
+        self._flush(out, force=True)
+        with self._hashes_lock:
+            self._hashes[repo] = digests
+        self._save_hashes()
+
+    # bulk re-index: {rel: edited spans}; files gone from disk are dropped and
+    # files whose content is what was last indexed are skipped. New chunks are
+    # embedded and written in BATCH_SIZE batches across files.
+    def update_files(
+        self,
+        repo: str,
+        root: Path,
+        files: Dict[str, List[Tuple[int, int]]],
+        texts: Optional[Dict[str, str]] = None,
+    ):
+        texts = texts or {}
+        # only a full index_repository pass starts tracking a repo
+        known = self._hashes.get(repo)
+        cutoffs, pending = {}, []
+        for rel, spans in files.items():
+            text = texts.get(rel)
+            if text is None and (root / rel).is_file():
+                text = self._read(root / rel)
+            digest = None if text is None else self._digest(text)
+            if known is not None and digest is not None and known.get(rel) == digest:
+                continue
+            cutoffs[rel] = self._cutoff(spans)
+            pending.append((rel, text, digest))
+        if not cutoffs:
+            return
+        # old chunks go first: re-adding an id that still exists is a no-op
+        self._delete_from(repo, cutoffs)
+        out = ([], [], [])
+        for rel, text, _ in pending:
+            if text is not None:
+                self._chunks(repo, rel, text, cutoffs[rel], out)
+                self._flush(out)
+        self._flush(out, force=True)
+        if known is None:
+            return
+        # recorded only now that every chunk is stored: if embedding or add
+        # raised, the old digests make these files look changed next time
+        with self._hashes_lock:
+            for rel, _, digest in pending:
+                if digest is None:
+                    known.pop(rel, None)
+                else:
+                    known[rel] = digest
+        self._save_hashes()
 
     # vector search
     def search(self, repo: str, query: str, limit: int):
-        res = self.col.query(query_texts=[query], n_results=limit, where={"repo": repo})
+        res = self.col.query(
+            query_embeddings=self._embed([query]),
+            n_results=limit,
+            where={"repo": repo},
+        )
         return [
             {"file": meta["file"], "snippet": doc}
             for doc, meta in zip(res["documents"][0], res["metadatas"][0])
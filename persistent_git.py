@@ -0,0 +1,67 @@
+# persistent_git.py – long-lived `git cat-file --batch` per repository
+#
+# Reading many objects through one batch process avoids a fork/exec and a
+# repository load per read. Requests are "<rev>:<path>\n"; replies are
+# "<sha> blob <size>\n<bytes>\n" or "<rev> missing\n".
+
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+class PersistentGit:
+    def __init__(self, root: Path):
+        self.root = root
+        self.proc: Optional[subprocess.Popen] = None
+        self.lock = threading.Lock()  # one request/reply in flight at a time
+
+    # spawn the helper if it isn't running; False if git can't be started
+    def start(self) -> bool:
+        if self.proc is not None and self.proc.poll() is None:
+            return True
+        try:
+            self.proc = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.root,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            self.proc = None
+            return False
+        return True
+
+    # (sha, bytes) of `rel` at `rev`; None if missing or the pipe is broken
+    def blob(self, rel: str, rev: str = "HEAD") -> Optional[Tuple[str, bytes]]:
+        if "\n" in rel:
+            return None
+        with self.lock:
+            if not self.start():
+                return None
+            out = self.proc.stdout
+            try:
+                self.proc.stdin.write(f"{rev}:./{rel}\n".encode())
+                self.proc.stdin.flush()
+                header = out.readline().split()
+                if len(header) != 3 or header[1] != b"blob":
+                    return None  # "<object> missing", untracked file, etc.
+                data = out.read(int(header[2]))
+                out.read(1)  # trailing LF
+                return header[0].decode(), data
+            except (OSError, ValueError):  # stream is out of sync → respawn
+                self.proc.kill()
+                self.proc = None
+                return None
+
+    def close(self):
+        with self.lock:
+            proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
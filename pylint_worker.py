@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# pylint_worker.py – long-lived pylint process (one per repository root)
+#
+# Protocol (one JSON document per line):
+#   → startup:  {"ready": true} or {"ready": false, "error": "..."}
+#   ← request:  {"args": ["some/file.py"], "max_issues": 20}
+#   → response: {"messages": [...], "truncated": false}
+#            or {"error": "..."}
+#
+# Only error/warning records are returned (in pylint's JSON format). Once
+# max_issues of them have been seen the run is abandoned – the verdict can't
+# change and the rest of the lint work would be thrown away anyway.
+#
+# Keeping the interpreter alive means pylint, astroid and their plugins are
+# imported once, and astroid's inference cache for third-party / stdlib
+# modules survives between runs. Modules under the working directory are
+# evicted before every run so edits are always seen.
+
+import contextlib
+import io
+import json
+import os
+import sys
+import traceback
+
+# don't let our own modules shadow the project being linted
+if sys.path and os.path.abspath(sys.path[0]) == os.path.dirname(
+    os.path.abspath(__file__)
+):
+    sys.path.pop(0)
+
+
+class _Enough(BaseException):
+    """Raised from the reporter to stop a run; not an Exception so pylint's
+    own per-file error handling doesn't swallow it."""
+
+
+def _forget_project_modules(manager, root: str):
+    for name, mod in list(manager.astroid_cache.items()):
+        if (getattr(mod, "file", None) or "").startswith(root):
+            del manager.astroid_cache[name]
+    manager._mod_file_cache.clear()  # pylint: disable=protected-access
+
+
+def main():
+    out = sys.stdout
+    try:
+        from astroid import MANAGER
+        from pylint.lint import Run
+        from pylint.reporters import BaseReporter
+        from pylint.reporters.json_reporter import JSONReporter
+    except ImportError as exc:
+        out.write(json.dumps({"ready": False, "error": str(exc)}) + "\n")
+        out.flush()
+        return
+
+    class IssueCollector(BaseReporter):
+        name = "daz-issues"
+
+        def __init__(self, limit: int):
+            super().__init__(io.StringIO())
+            self.issues = []
+            self.limit = limit
+
+        def handle_message(self, msg):
+            if msg.category in ("error", "warning"):
+                self.issues.append(JSONReporter.serialize(msg))
+                if self.limit and len(self.issues) >= self.limit:
+                    raise _Enough
+
+        def display_messages(self, layout):
+            pass
+
+        def display_reports(self, layout):
+            pass
+
+        def _display(self, layout):
+            pass
+
+    out.write(json.dumps({"ready": True}) + "\n")
+    out.flush()
+    root = os.getcwd()
+
+    for line in sys.stdin:
+        try:
+            req = json.loads(line)
+            _forget_project_modules(MANAGER, root)
+            reporter = IssueCollector(req.get("max_issues", 0))
+            truncated = False
+            # anything pylint prints must not corrupt the protocol stream
+            with contextlib.redirect_stdout(sys.stderr):
+                try:
+                    Run(["--exit-zero", *req["args"]], reporter=reporter, exit=False)
+                except _Enough:
+                    truncated = True
+            resp = {"messages": reporter.issues, "truncated": truncated}
+        except (Exception, SystemExit):  # keep serving; report this run failed
+            resp = {"error": traceback.format_exc()}
+        out.write(json.dumps(resp) + "\n")
+        out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# unittest_runner.py – run a project's tests like `python -m unittest -v`
+#
+#   unittest_runner.py                → discover tests in every *.py under cwd
+#   unittest_runner.py pkg.module ... → just those modules
+#
+# Exit status: 0 passed, 1 failed, 5 nothing collected (pytest's code, and
+# what unittest itself uses from Python 3.12). The verifier checks the status
+# rather than grepping the output for "Ran 0 tests".
+
+import os
+import sys
+import unittest
+
+NO_TESTS = 5
+
+# don't let our own modules shadow the project under test
+if sys.path and os.path.abspath(sys.path[0]) == os.path.dirname(
+    os.path.abspath(__file__)
+):
+    sys.path.pop(0)
+
+
+def main(names) -> int:
+    sys.path.insert(0, os.getcwd())  # as `python -m unittest` does
+    loader = unittest.TestLoader()
+    if names:
+        suite = loader.loadTestsFromNames(names)
+    else:
+        suite = loader.discover(".", pattern="*.py")
+    if suite.countTestCases() == 0:
+        print("Ran 0 tests", file=sys.stderr)
+        return NO_TESTS
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))